@@ -67,6 +67,10 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.5.0",
         ],
+        "speedups": [
+            "pyarrow>=12.0.0",
+            "orjson>=3.8.0",
+        ],
         "build": [
             "pyinstaller>=5.13.0",
             "setuptools>=68.0.0",
@@ -13,6 +13,7 @@ from enum import Enum
 import pandas as pd
 
 from ..core.interfaces import IOllamaClient
+from ..utils.compat import DATACLASS_SLOTS
 
 
 class MessageType(Enum):
@@ -31,7 +32,7 @@ class AgentStatus(Enum):
     STOPPED = "stopped"
 
 
-@dataclass
+@dataclass(eq=False, **DATACLASS_SLOTS)
 class AgentMessage:
     """Message structure for inter-agent communication."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -58,12 +59,26 @@ class BaseAgent(ABC):
     def __init__(self, agent_id: str, ollama_client: IOllamaClient):
         self.agent_id = agent_id
         self.ollama_client = ollama_client
-        self.status = AgentStatus.IDLE
+        self.status_listener: Optional[Callable[[str], None]] = None
+        self._status = AgentStatus.IDLE
         self.capabilities = self._define_capabilities()
         self.message_handlers: Dict[MessageType, Callable] = {}
         self.results_cache: Dict[str, Any] = {}
         self._setup_message_handlers()
     
+    @property
+    def status(self) -> AgentStatus:
+        """Current execution status of the agent."""
+        return self._status
+    
+    @status.setter
+    def status(self, value: AgentStatus):
+        if value is self._status:
+            return
+        self._status = value
+        if self.status_listener:
+            self.status_listener(self.agent_id)
+    
     @abstractmethod
     def _define_capabilities(self) -> AgentCapability:
         """Define what this agent can do."""
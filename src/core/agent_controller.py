@@ -6,15 +6,18 @@ Orchestrates agent communication and task distribution.
 import asyncio
 import uuid
 import time
-from typing import Dict, List, Any, Optional, Type
+from typing import Dict, List, Any, Optional, Tuple, Type
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
 from .interfaces import IOllamaClient
 from ..agents.base_agent import BaseAgent, AgentMessage, MessageType, AgentStatus
+from ..utils.compat import DATACLASS_SLOTS
+from ..utils.logger import get_queued_logger
 
 
-@dataclass
+@dataclass(eq=False, **DATACLASS_SLOTS)
 class AnalysisTask:
     """Represents an analysis task to be processed by agents."""
     task_id: str
@@ -30,7 +33,7 @@ class AnalysisTask:
             self.created_at = time.time()
 
 
-@dataclass
+@dataclass(eq=False, **DATACLASS_SLOTS)
 class AnalysisResult:
     """Result from agent analysis."""
     task_id: str
@@ -51,15 +54,23 @@ class AnalysisResult:
 class AgentController:
     """Controls and coordinates all agents in the system."""
     
+    STATUS_CACHE_TTL = 1.0
+    
     def __init__(self, ollama_client: IOllamaClient):
         self.ollama_client = ollama_client
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_types: Dict[str, Type[BaseAgent]] = {}
         self.task_queue = asyncio.Queue()
         self.results_cache: Dict[str, AnalysisResult] = {}
+        self._results_cv: Optional[asyncio.Condition] = None
+        self._results_cv_loop: Optional[asyncio.AbstractEventLoop] = None
         self.message_queue = asyncio.Queue()
         self.running = False
         self._worker_tasks: List[asyncio.Task] = []
+        self._log = get_queued_logger('agent_controller')
+        self._agent_statuses: Dict[str, Dict[str, Any]] = {}
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._pending_responses: Dict[str, asyncio.Future] = {}
     
     def register_agent_type(self, agent_type: str, agent_class: Type[BaseAgent]):
         """Register an agent type for dynamic instantiation."""
@@ -75,10 +86,19 @@ class AgentController:
         
         agent_class = self.agent_types[agent_type]
         agent = agent_class(agent_id, self.ollama_client)
+        agent.status_listener = self._on_agent_status_change
         self.agents[agent_id] = agent
+        self._on_agent_status_change(agent_id)
         
         return agent_id
     
+    def _on_agent_status_change(self, agent_id: str):
+        """Refresh the stored status of an agent after a state transition."""
+        agent = self.agents.get(agent_id)
+        if agent is not None:
+            self._agent_statuses[agent_id] = agent.get_status()
+        self._status_cache = None
+    
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Get agent by ID."""
         return self.agents.get(agent_id)
@@ -123,14 +143,36 @@ class AgentController:
     
     async def get_analysis_result(self, task_id: str, timeout: float = 30.0) -> Optional[AnalysisResult]:
         """Get analysis result by task ID with timeout."""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if task_id in self.results_cache:
-                return self.results_cache[task_id]
-            await asyncio.sleep(0.1)
+        results_cv = self._results_condition()
+        async with results_cv:
+            try:
+                await asyncio.wait_for(
+                    results_cv.wait_for(lambda: task_id in self.results_cache),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+            return self.results_cache[task_id]
+    
+    async def _store_result(self, result: AnalysisResult):
+        """Store a result and wake up any waiters."""
+        results_cv = self._results_condition()
+        async with results_cv:
+            self.results_cache[result.task_id] = result
+            results_cv.notify_all()
+    
+    def _results_condition(self) -> asyncio.Condition:
+        """The result condition for the running event loop.
         
-        return None
+        Created lazily: the controller may be built on a thread other than
+        the one running its loop, and on Python < 3.10 a Condition binds to
+        the loop current at construction.
+        """
+        loop = asyncio.get_running_loop()
+        if self._results_cv is None or self._results_cv_loop is not loop:
+            self._results_cv = asyncio.Condition()
+            self._results_cv_loop = loop
+        return self._results_cv
     
     async def execute_analysis_pipeline(self, data: pd.DataFrame, analysis_type: str, 
                                       parameters: Dict[str, Any] = None) -> AnalysisResult:
@@ -156,128 +198,214 @@ class AgentController:
         
         return result
     
+    async def execute_batch(self, data: pd.DataFrame, analysis_types: List[str],
+                            parameters: Dict[str, Any] = None) -> Dict[str, AnalysisResult]:
+        """Run several analyses of the same data concurrently.
+        
+        The data type is determined once for all of them, and the analyses
+        go straight to their agents instead of queueing behind each other.
+        Results are keyed by analysis type.
+        """
+        if parameters is None:
+            parameters = {}
+        
+        data_type = self._determine_data_type(data)
+        tasks = [
+            AnalysisTask(
+                task_id=str(uuid.uuid4()),
+                data=data,
+                analysis_type=analysis_type,
+                parameters=parameters
+            )
+            for analysis_type in analysis_types
+        ]
+        
+        results = await asyncio.gather(*(self._run_task(task, data_type) for task in tasks))
+        
+        batch = {}
+        for task, result in zip(tasks, results):
+            if result is None:
+                raise RuntimeError(f"Analysis task {task.task_id} returned no result")
+            await self._store_result(result)
+            batch[task.analysis_type] = result
+        return batch
+    
     async def send_message(self, message: AgentMessage):
         """Send a message to the message queue for routing."""
         await self.message_queue.put(message)
     
+    async def send_message_and_await(self, message: AgentMessage,
+                                     timeout: Optional[float] = None) -> Optional[AgentMessage]:
+        """Send a message and wait for the recipient's response.
+        
+        Local recipients are called directly without going through the message
+        queue; any other message is routed and resolved by its correlated response.
+        ``timeout`` bounds the wait either way.
+        """
+        recipient_agent = self.agents.get(message.recipient)
+        if recipient_agent is not None:
+            return await asyncio.wait_for(recipient_agent.process_message(message), timeout)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending_responses[message.id] = future
+        try:
+            await self.message_queue.put(message)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending_responses.pop(message.id, None)
+    
+    def _resolve_pending_response(self, message: AgentMessage) -> bool:
+        """Resolve the waiter for a correlated response, if there is one."""
+        future = self._pending_responses.get(message.correlation_id)
+        if future is None or future.done():
+            return False
+        future.set_result(message)
+        return True
+    
     async def _task_processor(self):
         """Process tasks from the task queue."""
         while self.running:
             try:
-                # Get task from queue with timeout
-                task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
+                task = await self.task_queue.get()
                 
-                # Find capable agents
-                data_type = self._determine_data_type(task.data)
-                capable_agents = self.get_agents_by_capability(task.analysis_type, data_type)
-                
-                if not capable_agents:
-                    # No capable agents found
-                    result = AnalysisResult(
-                        task_id=task.task_id,
-                        agent_id="system",
-                        results={"error": f"No agents capable of handling {task.analysis_type} for {data_type}"},
-                        confidence_score=0.0,
-                        methodology="error"
-                    )
-                    self.results_cache[task.task_id] = result
-                    continue
+                result = await self._run_task(task)
+                if result is not None:
+                    await self._store_result(result)
                 
-                # Select best agent (for now, just use the first one)
-                selected_agent = capable_agents[0]
-                
-                # Create request message
-                request_message = AgentMessage(
-                    sender="controller",
-                    recipient=selected_agent.agent_id,
-                    message_type=MessageType.REQUEST,
-                    payload={
-                        "task_id": task.task_id,
-                        "data": task.data,
-                        "analysis_type": task.analysis_type,
-                        "parameters": task.parameters,
-                        "user_query": task.user_query
-                    }
-                )
-                
-                # Process request
-                response = await selected_agent.process_message(request_message)
-                
-                if response and response.message_type == MessageType.RESPONSE:
-                    # Create analysis result
-                    result = AnalysisResult(
-                        task_id=task.task_id,
-                        agent_id=selected_agent.agent_id,
-                        results=response.payload.get("results", {}),
-                        confidence_score=response.payload.get("confidence_score", 0.0),
-                        methodology=response.payload.get("methodology", "unknown"),
-                        visualizations=response.payload.get("visualizations", [])
-                    )
-                    self.results_cache[task.task_id] = result
-                elif response and response.message_type == MessageType.ERROR:
-                    # Handle error
-                    result = AnalysisResult(
-                        task_id=task.task_id,
-                        agent_id=selected_agent.agent_id,
-                        results={"error": response.payload.get("error", "Unknown error")},
-                        confidence_score=0.0,
-                        methodology="error"
-                    )
-                    self.results_cache[task.task_id] = result
-                
-            except asyncio.TimeoutError:
-                # No tasks in queue, continue
-                continue
+            except asyncio.CancelledError:
+                # Controller is stopping
+                break
             except Exception as e:
                 # Log error and continue
-                print(f"Error processing task: {e}")
+                self._log.exception("Error processing task: %s", e)
                 continue
     
+    async def _run_task(self, task: AnalysisTask,
+                        data_type: Optional[str] = None) -> Optional[AnalysisResult]:
+        """Run a task on the first capable agent and build its result.
+        
+        ``data_type`` may be passed in when several tasks share the same data.
+        Returns None if the agent gave no usable response.
+        """
+        # Find capable agents
+        if data_type is None:
+            data_type = self._determine_data_type(task.data)
+        capable_agents = self.get_agents_by_capability(task.analysis_type, data_type)
+        
+        if not capable_agents:
+            # No capable agents found
+            return AnalysisResult(
+                task_id=task.task_id,
+                agent_id="system",
+                results={"error": f"No agents capable of handling {task.analysis_type} for {data_type}"},
+                confidence_score=0.0,
+                methodology="error"
+            )
+        
+        # Select best agent (for now, just use the first one)
+        selected_agent = capable_agents[0]
+        
+        # Create request message
+        request_message = AgentMessage(
+            sender="controller",
+            recipient=selected_agent.agent_id,
+            message_type=MessageType.REQUEST,
+            payload={
+                "task_id": task.task_id,
+                "data": task.data,
+                "analysis_type": task.analysis_type,
+                "parameters": task.parameters,
+                "user_query": task.user_query
+            }
+        )
+        
+        # Process request
+        response = await selected_agent.process_message(request_message)
+        
+        if response and response.message_type == MessageType.RESPONSE:
+            # Create analysis result
+            return AnalysisResult(
+                task_id=task.task_id,
+                agent_id=selected_agent.agent_id,
+                results=response.payload.get("results", {}),
+                confidence_score=response.payload.get("confidence_score", 0.0),
+                methodology=response.payload.get("methodology", "unknown"),
+                visualizations=response.payload.get("visualizations", [])
+            )
+        elif response and response.message_type == MessageType.ERROR:
+            # Handle error
+            return AnalysisResult(
+                task_id=task.task_id,
+                agent_id=selected_agent.agent_id,
+                results={"error": response.payload.get("error", "Unknown error")},
+                confidence_score=0.0,
+                methodology="error"
+            )
+        return None
+    
     async def _message_router(self):
         """Route messages between agents."""
         while self.running:
             try:
-                # Get message from queue with timeout
-                message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
+                message = await self.message_queue.get()
+                
+                # Hand correlated responses straight to their waiter
+                if message.correlation_id and self._resolve_pending_response(message):
+                    continue
                 
                 # Find recipient agent
                 recipient_agent = self.agents.get(message.recipient)
                 if recipient_agent:
                     # Process message
                     response = await recipient_agent.process_message(message)
-                    if response:
+                    if response and not self._resolve_pending_response(response):
                         # Route response back
                         await self.message_queue.put(response)
                 
-            except asyncio.TimeoutError:
-                # No messages in queue, continue
-                continue
+            except asyncio.CancelledError:
+                # Controller is stopping
+                break
             except Exception as e:
                 # Log error and continue
-                print(f"Error routing message: {e}")
+                self._log.exception("Error routing message: %s", e)
                 continue
     
     def _determine_data_type(self, data: pd.DataFrame) -> str:
         """Determine the type of data for agent selection."""
         # Simple heuristic - can be made more sophisticated
-        if 'date' in data.columns or 'time' in data.columns:
+        kinds = np.array([dtype.kind for dtype in data.dtypes])
+        if 'date' in data.columns or 'time' in data.columns or np.isin(kinds, ['M', 'm']).any():
             return "time_series"
-        elif len(data.columns) > 10:
+        elif len(kinds) > 10:
             return "multivariate"
-        elif data.dtypes.apply(lambda x: x.kind in 'biufc').all():
+        elif np.isin(kinds, list('biufc')).all():
             return "numerical"
         else:
             return "mixed"
     
     def get_system_status(self) -> Dict[str, Any]:
-        """Get overall system status."""
-        agent_statuses = {}
-        for agent_id, agent in self.agents.items():
-            agent_statuses[agent_id] = agent.get_status()
+        """Get overall system status.
+        
+        Agent statuses are pushed by the agents on state transitions, and
+        that snapshot is reused for up to ``STATUS_CACHE_TTL`` seconds.
+        Queue sizes, agent cache sizes and the running flag are always read
+        live. Callers get their own copy.
+        """
+        now = time.monotonic()
+        if self._status_cache is None or now - self._status_cache[0] >= self.STATUS_CACHE_TTL:
+            self._status_cache = (now, dict(self._agent_statuses))
+        
+        # Agent result caches grow without a state transition
+        agents = {}
+        for agent_id, agent_status in self._status_cache[1].items():
+            agents[agent_id] = agent_status = dict(agent_status)
+            agent = self.agents.get(agent_id)
+            if agent is not None:
+                agent_status["cache_size"] = len(agent.results_cache)
         
         return {
             "running": self.running,
-            "agents": agent_statuses,
+            "agents": agents,
             "task_queue_size": self.task_queue.qsize(),
             "message_queue_size": self.message_queue.qsize(),
             "results_cache_size": len(self.results_cache)
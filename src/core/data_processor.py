@@ -7,15 +7,46 @@ import pandas as pd
 import numpy as np
 import json
 import xml.etree.ElementTree as ET
-from typing import Dict, Any, List, Optional, Iterator, Union, Tuple
+from typing import Dict, Any, Callable, List, Optional, Iterator, Mapping, Union, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import io
+import os
 import re
+import warnings
+import weakref
 from pathlib import Path
 
 from .interfaces import IDataProcessor, ValidationResult
 from ..utils.config import config_manager
+from ..utils.logger import get_logger
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = get_logger('data_processor')
+
+# Copy-on-write (always on from pandas 3.0) lets cleaning steps share
+# unchanged columns with their input instead of copying whole frames
+PANDAS_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+# Number of DataFrames whose detected types are remembered
+TYPE_CACHE_SIZE = 32
+
+# Rows probed when checking whether values parse as numbers or dates
+DETECTION_SAMPLE_SIZE = 1000
+
+# Frames with at least this many columns are type-detected in parallel
+PARALLEL_DETECTION_MIN_COLUMNS = 8
+
+# Text values accepted as booleans
+_VALID_BOOL = frozenset({'true', 'false', '1', '0', 'yes', 'no', 'y', 'n'})
+_BOOL_ARR = np.array(sorted(_VALID_BOOL))
+_TRUE_ARR = np.array(['1', 'true', 'y', 'yes'])
 
 
 class DataType(Enum):
@@ -64,6 +95,7 @@ class CleaningRules:
     outlier_threshold: float = 3.0
     normalize_text: bool = True
     convert_data_types: bool = True
+    inference_method: str = "sample"  # sample, full
     custom_rules: Dict[str, Any] = None
     
     def __post_init__(self):
@@ -71,6 +103,28 @@ class CleaningRules:
             self.custom_rules = {}
 
 
+class LazyTypes(Mapping):
+    """Column-to-type mapping that detects each column's type on first access."""
+    
+    def __init__(self, detector: Callable[[pd.Series], str], data: pd.DataFrame):
+        self._detector = detector
+        self._data = data
+        self._types: Dict[str, str] = {}
+    
+    def __getitem__(self, column: str) -> str:
+        if column not in self._types:
+            if column not in self._data.columns:
+                raise KeyError(column)
+            self._types[column] = self._detector(self._data[column])
+        return self._types[column]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data.columns)
+    
+    def __len__(self) -> int:
+        return len(self._data.columns)
+
+
 class DataProcessor(IDataProcessor):
     """Main data processing class."""
     
@@ -78,9 +132,12 @@ class DataProcessor(IDataProcessor):
         """Initialize data processor."""
         config = config_manager.get_config()
         self.chunk_size = config.excel_settings.max_rows_per_chunk
+        self.inference_sample_size = config.excel_settings.inference_sample_size
         self.validators = self._initialize_validators()
         self.cleaners = self._initialize_cleaners()
         self.type_detectors = self._initialize_type_detectors()
+        self._type_cache: Dict[tuple, Tuple[weakref.ref, Dict[str, str]]] = {}
+        self._numeric_columns_cache: Dict[tuple, Tuple[weakref.ref, List[str]]] = {}
     
     def _initialize_validators(self) -> Dict[str, callable]:
         """Initialize data validation functions."""
@@ -106,11 +163,14 @@ class DataProcessor(IDataProcessor):
         }
     
     def _initialize_type_detectors(self) -> Dict[DataType, callable]:
-        """Initialize data type detection functions."""
+        """Initialize data type detection functions.
+        
+        Listed in the precedence order ``_infer_column_values`` applies them.
+        """
         return {
+            DataType.BOOLEAN: self._detect_boolean,
             DataType.NUMERIC: self._detect_numeric,
             DataType.DATETIME: self._detect_datetime,
-            DataType.BOOLEAN: self._detect_boolean,
             DataType.CATEGORICAL: self._detect_categorical,
             DataType.TEXT: self._detect_text
         }
@@ -178,7 +238,9 @@ class DataProcessor(IDataProcessor):
     
     def clean_data(self, data: pd.DataFrame, cleaning_rules: CleaningRules) -> pd.DataFrame:
         """Clean and preprocess data according to rules."""
-        cleaned_data = data.copy()
+        # Under copy-on-write only the columns that are modified get copied;
+        # older pandas needs a full copy to leave the input untouched
+        cleaned_data = data.copy(deep=not PANDAS_COPY_ON_WRITE)
         
         # Handle missing values
         if cleaning_rules.missing_value_strategy in self.cleaners:
@@ -191,7 +253,7 @@ class DataProcessor(IDataProcessor):
             cleaned_data = cleaned_data.drop_duplicates()
             removed_count = initial_count - len(cleaned_data)
             if removed_count > 0:
-                print(f"Removed {removed_count} duplicate rows")
+                logger.info("Removed %d duplicate rows", removed_count)
         
         # Handle outliers
         if cleaning_rules.handle_outliers:
@@ -203,50 +265,132 @@ class DataProcessor(IDataProcessor):
         
         # Normalize text columns
         if cleaning_rules.normalize_text:
-            text_columns = self._get_text_columns(cleaned_data)
-            for col in text_columns:
-                cleaned_data[col] = self._normalize_text_column(cleaned_data[col])
+            cleaned_data = self._normalize_text_columns(cleaned_data)
         
         # Convert data types
         if cleaning_rules.convert_data_types:
-            cleaned_data = self._convert_data_types(cleaned_data)
+            cleaned_data = self._convert_data_types(cleaned_data, cleaning_rules.inference_method)
         
         # Apply custom rules
         if cleaning_rules.custom_rules:
             cleaned_data = self._apply_custom_rules(cleaned_data, cleaning_rules.custom_rules)
         
+        # Cached detections describe the data before it was mutated
+        self._invalidate_type_cache(cleaned_data)
+        
         return cleaned_data
     
-    def chunk_large_dataset(self, data: pd.DataFrame) -> Iterator[pd.DataFrame]:
-        """Split large dataset into manageable chunks."""
+    def chunk_large_dataset(self, data: pd.DataFrame, copy: bool = False) -> Iterator[pd.DataFrame]:
+        """Split large dataset into manageable chunks.
+        
+        Chunks are views into ``data`` unless ``copy`` is True; consumers that
+        modify a chunk, or keep it after ``data`` changes, should request copies.
+        """
         if len(data) <= self.chunk_size:
             yield data
             return
         
         for start_idx in range(0, len(data), self.chunk_size):
             end_idx = min(start_idx + self.chunk_size, len(data))
-            yield data.iloc[start_idx:end_idx].copy()
+            chunk = data.iloc[start_idx:end_idx]
+            yield chunk.copy() if copy else chunk
+    
+    def detect_data_types(self, data: pd.DataFrame,
+                          precomputed: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Detect data types for each column.
+        
+        If ``precomputed`` types are given (e.g. ``ValidationResult.data_types``
+        from an earlier ``validate_data`` call), they are returned as-is.
+        """
+        if precomputed is not None:
+            return dict(precomputed)
+        return dict(self._detect_with_values(data)[0])
+    
+    def _detect_with_values(self, data: pd.DataFrame) -> Tuple[Dict[str, str], Dict[str, pd.Series]]:
+        """Detect column types, keeping the coerced values computed on the way.
+        
+        Returns the detected types and, for numeric/datetime columns whose
+        values were all parsed during inference, the parsed values.
+        """
+        key = self._cache_key(data)
+        cached = self._cache_get(self._type_cache, key, data)
+        if cached is not None:
+            return cached
+        
+        columns = list(data.columns)
+        if len(columns) >= PARALLEL_DETECTION_MIN_COLUMNS:
+            # pandas parsing releases the GIL, so columns can be probed concurrently
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                results = list(executor.map(
+                    lambda column: self._infer_column_values(data[column], self.inference_sample_size),
+                    columns
+                ))
+        else:
+            results = [self._infer_column_values(data[column], self.inference_sample_size) for column in columns]
+        
+        detected_types = {column: result[0] for column, result in zip(columns, results)}
+        coerced_values = {column: result[1] for column, result in zip(columns, results) if result[1] is not None}
+        
+        self._cache_put(self._type_cache, key, data, (detected_types, coerced_values))
+        return detected_types, coerced_values
     
-    def detect_data_types(self, data: pd.DataFrame) -> Dict[str, str]:
-        """Detect data types for each column."""
-        detected_types = {}
+    def _infer_column(self, column_data: pd.Series, sample_size: Optional[int] = None) -> str:
+        """Infer the data type of a single column."""
+        return self._infer_column_values(column_data, sample_size)[0]
+    
+    def _infer_column_values(self, column_data: pd.Series,
+                             sample_size: Optional[int] = None) -> Tuple[str, Optional[pd.Series]]:
+        """Infer the data type of a single column in one precedence pass.
         
-        for column in data.columns:
-            series = data[column].dropna()
-            
-            if len(series) == 0:
-                detected_types[column] = DataType.UNKNOWN.value
-                continue
-            
-            # Try each detector in order of specificity
-            for data_type, detector in self.type_detectors.items():
-                if detector(series):
-                    detected_types[column] = data_type.value
-                    break
-            else:
-                detected_types[column] = DataType.UNKNOWN.value
+        Types are tried from most to least specific (boolean, numeric,
+        datetime, categorical, text), coercing instead of raising so each
+        value is parsed at most once per type. Columns longer than
+        ``sample_size`` are inferred from a reproducible random sample.
+        
+        Returns the type and, when the whole column was parsed as numeric or
+        datetime, the parsed values.
+        """
+        series = column_data.dropna()
+        
+        if len(series) == 0:
+            return DataType.UNKNOWN.value, None
+        
+        sampled = sample_size is not None and len(series) > sample_size
+        if sampled:
+            series = series.sample(sample_size, random_state=0)
+        
+        # Native dtypes need no parsing
+        if pd.api.types.is_bool_dtype(series):
+            return DataType.BOOLEAN.value, None
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return DataType.DATETIME.value, None
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return DataType.CATEGORICAL.value, None
+        
+        # Numbers come before the boolean vocabulary so 0/1 columns keep
+        # their parsed values for the check. Only text columns of 0/1 are
+        # flags; native numeric columns stay numeric whatever their values.
+        numeric = self._parse_numeric(series)
+        if numeric is not None:
+            if self._is_text_dtype(series) and numeric.isin([0, 1]).all():
+                return DataType.BOOLEAN.value, None
+            return DataType.NUMERIC.value, None if sampled else numeric
         
-        return detected_types
+        if self._detect_boolean(series):
+            return DataType.BOOLEAN.value, None
+        
+        datetimes = self._parse_datetime(series)
+        if datetimes is not None:
+            return DataType.DATETIME.value, None if sampled else datetimes
+        
+        if self._detect_categorical(series):
+            return DataType.CATEGORICAL.value, None
+        
+        # Already known not to parse as dates, so only the dtype is checked
+        if self._is_text_dtype(series):
+            return DataType.TEXT.value, None
+        
+        return DataType.UNKNOWN.value, None
     
     def handle_missing_values(self, data: pd.DataFrame, strategy: str = 'auto') -> pd.DataFrame:
         """Handle missing values with specified strategy."""
@@ -268,22 +412,28 @@ class DataProcessor(IDataProcessor):
         else:
             return data
     
-    def get_data_quality_metrics(self, data: pd.DataFrame) -> DataQualityMetrics:
-        """Calculate comprehensive data quality metrics."""
+    def get_data_quality_metrics(self, data: pd.DataFrame,
+                                 data_types: Optional[Dict[str, str]] = None) -> DataQualityMetrics:
+        """Calculate comprehensive data quality metrics.
+        
+        Pass the ``data_types`` of a previous ``validate_data`` result to skip
+        detecting the column types again.
+        """
+        detected_types = self.detect_data_types(data, precomputed=data_types)
         total_cells = len(data) * len(data.columns)
-        missing_values = data.isnull().sum().sum()
         duplicate_rows = data.duplicated().sum()
         
-        # Detect outliers
-        outliers = 0
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            outliers += self._count_outliers(data[col])
+        # Missing values and outliers of numeric columns come from one float block
+        numeric_columns = self._numeric_columns(data)
+        numeric_values = data[numeric_columns].to_numpy(dtype=float, na_value=np.nan)
+        other_columns = data.drop(columns=numeric_columns)
+        missing_values = int(np.isnan(numeric_values).sum() + other_columns.isna().to_numpy().sum())
+        outliers = self._count_outliers_array(numeric_values)
         
         # Calculate quality scores
         completeness_score = 1.0 - (missing_values / total_cells) if total_cells > 0 else 0.0
         consistency_score = 1.0 - (duplicate_rows / len(data)) if len(data) > 0 else 0.0
-        validity_score = self._calculate_validity_score(data)
+        validity_score = self._calculate_validity_score(data, detected_types)
         
         return DataQualityMetrics(
             total_rows=len(data),
@@ -291,16 +441,58 @@ class DataProcessor(IDataProcessor):
             missing_values=missing_values,
             duplicate_rows=duplicate_rows,
             outliers=outliers,
-            data_types=self.detect_data_types(data),
+            data_types=detected_types,
             completeness_score=completeness_score,
             consistency_score=consistency_score,
             validity_score=validity_score
         )
     
+    def _cache_key(self, data: pd.DataFrame) -> tuple:
+        """Build the cache key identifying a DataFrame and its layout."""
+        return (id(data), data.shape[0], tuple(data.columns), tuple(data.dtypes))
+    
+    def _cache_get(self, cache: Dict[tuple, tuple], key: tuple, data: pd.DataFrame) -> Any:
+        """Look up a cached value, ignoring entries left by a collected DataFrame."""
+        entry = cache.get(key)
+        if entry is None or entry[0]() is not data:
+            return None
+        return entry[1]
+    
+    def _cache_put(self, cache: Dict[tuple, tuple], key: tuple, data: pd.DataFrame, value: Any):
+        """Store a value in a bounded cache, evicting the oldest entry."""
+        if key not in cache and len(cache) >= TYPE_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = (weakref.ref(data), value)
+    
+    def _invalidate_type_cache(self, data: pd.DataFrame):
+        """Forget cached detections for a DataFrame."""
+        key = self._cache_key(data)
+        self._type_cache.pop(key, None)
+        self._numeric_columns_cache.pop(key, None)
+    
+    def _numeric_columns(self, data: pd.DataFrame) -> List[str]:
+        """Get list of numeric columns."""
+        key = self._cache_key(data)
+        columns = self._cache_get(self._numeric_columns_cache, key, data)
+        if columns is None:
+            columns = data.select_dtypes(include=[np.number]).columns.tolist()
+            self._cache_put(self._numeric_columns_cache, key, data, columns)
+        return columns
+    
     # Data format converters
     def import_csv(self, file_path: str, **kwargs) -> pd.DataFrame:
-        """Import data from CSV file."""
+        """Import data from CSV file.
+        
+        Uses the multi-threaded pyarrow parser when pyarrow is installed and
+        the given options are supported by it.
+        """
         try:
+            if HAS_PYARROW and 'engine' not in kwargs:
+                try:
+                    return pd.read_csv(file_path, engine='pyarrow', **kwargs)
+                except ValueError:
+                    # Option not supported by the pyarrow engine
+                    pass
             return pd.read_csv(file_path, **kwargs)
         except Exception as e:
             raise ValueError(f"Error importing CSV: {e}")
@@ -321,24 +513,37 @@ class DataProcessor(IDataProcessor):
             raise ValueError(f"Error importing JSON: {e}")
     
     def import_xml(self, file_path: str, root_element: str = None) -> pd.DataFrame:
-        """Import data from XML file."""
+        """Import data from XML file.
+        
+        The file is parsed incrementally and each top-level subtree is freed
+        once read, so memory use does not grow with the size of the document.
+        """
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # If root_element is specified, find those elements
-            if root_element:
-                elements = root.findall(f".//{root_element}")
-            else:
-                # Use direct children of root
-                elements = list(root)
-            
             data = []
-            for element in elements:
-                row = {}
-                for child in element:
-                    row[child.tag] = child.text
-                data.append(row)
+            root = None
+            depth = 0
+            
+            for event, element in ET.iterparse(file_path, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = element
+                    depth += 1
+                    continue
+                
+                # If root_element is specified, use those elements at any depth,
+                # otherwise use direct children of root
+                if root_element:
+                    is_record = depth > 1 and element.tag == root_element
+                else:
+                    is_record = depth == 2
+                
+                if is_record:
+                    data.append({child.tag: child.text for child in element})
+                
+                if depth == 2:
+                    # Subtree fully read, release it
+                    root.clear()
+                depth -= 1
             
             return pd.DataFrame(data)
         except Exception as e:
@@ -366,7 +571,7 @@ class DataProcessor(IDataProcessor):
     def _validate_categorical(self, series: pd.Series) -> List[str]:
         """Validate categorical column."""
         errors = []
-        unique_ratio = len(series.unique()) / len(series)
+        unique_ratio = series.nunique(dropna=False) / len(series)
         if unique_ratio > 0.5:
             errors.append("High cardinality for categorical data")
         return errors
@@ -374,58 +579,86 @@ class DataProcessor(IDataProcessor):
     def _validate_text(self, series: pd.Series) -> List[str]:
         """Validate text column."""
         errors = []
-        if series.dtype != 'object':
+        if not self._is_text_dtype(series):
             errors.append("Text column should have object dtype")
         return errors
     
     def _validate_boolean(self, series: pd.Series) -> List[str]:
         """Validate boolean column."""
         errors = []
-        unique_values = set(series.dropna().astype(str).str.lower())
-        valid_boolean = {'true', 'false', '1', '0', 'yes', 'no', 'y', 'n'}
-        if not unique_values.issubset(valid_boolean):
+        # 0/1 numbers are valid flags; '1.0' as a string is not in the vocabulary
+        numeric = self._parse_numeric(series.dropna())
+        if numeric is not None:
+            valid = numeric.isin([0, 1]).all()
+        else:
+            valid = np.isin(self._lowered_strings(series), _BOOL_ARR).all()
+        if not valid:
             errors.append("Contains invalid boolean values")
         return errors
     
+    @staticmethod
+    def _parse_numeric(series: pd.Series) -> Optional[pd.Series]:
+        """Non-missing values parsed as numbers, or None unless all of them parse."""
+        numeric = pd.to_numeric(series, errors='coerce')
+        return numeric if numeric.notna().all() else None
+    
+    @staticmethod
+    def _parse_datetime(series: pd.Series) -> Optional[pd.Series]:
+        """Non-missing values parsed as datetimes, or None unless all of them parse."""
+        try:
+            datetimes = pd.to_datetime(series, errors='coerce')
+        except (ValueError, TypeError):
+            return None
+        return datetimes if datetimes.notna().all() else None
+    
+    @staticmethod
+    def _is_text_dtype(series: pd.Series) -> bool:
+        """Whether values are stored as text (object, or pandas 3's str dtype)."""
+        return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+    
     def _detect_numeric(self, series: pd.Series) -> bool:
         """Detect if series is numeric."""
-        try:
-            pd.to_numeric(series, errors='raise')
+        if pd.api.types.is_numeric_dtype(series):
             return True
-        except (ValueError, TypeError):
-            return False
+        
+        return self._parse_numeric(series.head(DETECTION_SAMPLE_SIZE).dropna()) is not None
     
     def _detect_datetime(self, series: pd.Series) -> bool:
         """Detect if series is datetime."""
-        if series.dtype.name.startswith('datetime'):
+        if pd.api.types.is_datetime64_any_dtype(series):
             return True
         
-        try:
-            pd.to_datetime(series, errors='raise')
-            return True
-        except (ValueError, TypeError):
-            return False
+        return self._parse_datetime(series.head(DETECTION_SAMPLE_SIZE).dropna()) is not None
     
     def _detect_boolean(self, series: pd.Series) -> bool:
         """Detect if series is boolean."""
         if series.dtype == bool:
             return True
         
-        unique_values = set(series.dropna().astype(str).str.lower())
-        boolean_values = {'true', 'false', '1', '0', 'yes', 'no', 'y', 'n'}
-        return len(unique_values) <= 2 and unique_values.issubset(boolean_values)
+        lowered = self._lowered_strings(series)
+        return bool(np.isin(lowered, _BOOL_ARR).all()) and np.unique(lowered).size <= 2
+    
+    def _lowered_strings(self, series: pd.Series) -> np.ndarray:
+        """Get non-missing values as lowercase strings for vocabulary checks.
+        
+        Values are truncated to 8 characters, which cannot turn a longer
+        string into one of the short boolean words.
+        """
+        return np.char.lower(series.dropna().to_numpy().astype('U8'))
     
     def _detect_categorical(self, series: pd.Series) -> bool:
         """Detect if series is categorical."""
         if series.dtype.name == 'category':
             return True
         
-        unique_ratio = len(series.unique()) / len(series)
-        return unique_ratio < 0.1 and len(series.unique()) < 50
+        unique_count = series.nunique(dropna=True)
+        if unique_count >= 50:
+            return False
+        return unique_count / len(series) < 0.1
     
     def _detect_text(self, series: pd.Series) -> bool:
         """Detect if series is text."""
-        return series.dtype == 'object' and not self._detect_datetime(series)
+        return self._is_text_dtype(series) and not self._detect_datetime(series)
     
     # Cleaning methods
     def _clean_drop_missing(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -434,16 +667,14 @@ class DataProcessor(IDataProcessor):
     
     def _clean_fill_mean(self, data: pd.DataFrame) -> pd.DataFrame:
         """Fill missing values with mean for numeric columns."""
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            data[col].fillna(data[col].mean(), inplace=True)
+        numeric = data[self._numeric_columns(data)]
+        data[numeric.columns] = numeric.fillna(numeric.mean())
         return data
     
     def _clean_fill_median(self, data: pd.DataFrame) -> pd.DataFrame:
         """Fill missing values with median for numeric columns."""
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            data[col].fillna(data[col].median(), inplace=True)
+        numeric = data[self._numeric_columns(data)]
+        data[numeric.columns] = numeric.fillna(numeric.median())
         return data
     
     def _clean_fill_mode(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -452,16 +683,16 @@ class DataProcessor(IDataProcessor):
             if data[col].isnull().any():
                 mode_value = data[col].mode()
                 if not mode_value.empty:
-                    data[col].fillna(mode_value.iloc[0], inplace=True)
+                    data[col] = data[col].fillna(mode_value.iloc[0])
         return data
     
     def _clean_fill_forward(self, data: pd.DataFrame) -> pd.DataFrame:
         """Forward fill missing values."""
-        return data.fillna(method='ffill')
+        return data.ffill()
     
     def _clean_fill_backward(self, data: pd.DataFrame) -> pd.DataFrame:
         """Backward fill missing values."""
-        return data.fillna(method='bfill')
+        return data.bfill()
     
     def _clean_fill_zero(self, data: pd.DataFrame) -> pd.DataFrame:
         """Fill missing values with zero."""
@@ -469,27 +700,23 @@ class DataProcessor(IDataProcessor):
     
     def _clean_interpolate(self, data: pd.DataFrame) -> pd.DataFrame:
         """Interpolate missing values."""
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            data[col] = data[col].interpolate()
+        numeric = data[self._numeric_columns(data)]
+        data[numeric.columns] = numeric.interpolate()
         return data
     
     def _handle_outliers(self, data: pd.DataFrame, method: str = 'iqr', threshold: float = 3.0) -> pd.DataFrame:
         """Handle outliers in numeric columns."""
-        numeric_columns = data.select_dtypes(include=[np.number]).columns
-        
-        for col in numeric_columns:
-            if method == 'iqr':
-                Q1 = data[col].quantile(0.25)
-                Q3 = data[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                data[col] = data[col].clip(lower_bound, upper_bound)
-            
-            elif method == 'zscore':
-                z_scores = np.abs((data[col] - data[col].mean()) / data[col].std())
-                data[col] = data[col][z_scores < threshold]
+        numeric = data[self._numeric_columns(data)]
+        if numeric.columns.empty:
+            return data
+        
+        if method == 'iqr':
+            lower_bound, upper_bound = self._iqr_bounds(numeric.to_numpy(dtype=float, na_value=np.nan))
+            data[numeric.columns] = numeric.clip(lower_bound, upper_bound, axis=1)
+        
+        elif method == 'zscore':
+            z_scores = ((numeric - numeric.mean()) / numeric.std()).abs()
+            data[numeric.columns] = numeric.where(z_scores < threshold)
         
         return data
     
@@ -501,25 +728,64 @@ class DataProcessor(IDataProcessor):
         """Normalize text in a column."""
         return series.astype(str).str.strip().str.lower()
     
-    def _convert_data_types(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _normalize_text_columns(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Normalize text in all text columns at once."""
+        text_columns = self._get_text_columns(data)
+        if text_columns:
+            data[text_columns] = data[text_columns].apply(self._normalize_text_column)
+        return data
+    
+    def _convert_data_types(self, data: pd.DataFrame, inference_method: str = 'sample') -> pd.DataFrame:
         """Convert columns to appropriate data types."""
-        detected_types = self.detect_data_types(data)
+        sample_size = self.inference_sample_size if inference_method == 'sample' else None
+        detected_types = LazyTypes(lambda series: self._infer_column(series, sample_size), data)
         
-        for column, data_type in detected_types.items():
+        for column in data.columns:
+            # Columns with a native dtype need no conversion or detection
+            if not (pd.api.types.is_object_dtype(data[column]) or
+                    isinstance(data[column].dtype, pd.StringDtype)):
+                continue
+            
+            data_type = detected_types[column]
             try:
                 if data_type == DataType.NUMERIC.value:
-                    data[column] = pd.to_numeric(data[column], errors='coerce')
+                    data[column] = self._downcast_numeric(pd.to_numeric(data[column], errors='coerce'))
                 elif data_type == DataType.DATETIME.value:
                     data[column] = pd.to_datetime(data[column], errors='coerce')
                 elif data_type == DataType.BOOLEAN.value:
-                    data[column] = data[column].astype(bool)
+                    data[column] = self._to_boolean(data[column])
                 elif data_type == DataType.CATEGORICAL.value:
                     data[column] = data[column].astype('category')
             except Exception as e:
-                print(f"Warning: Could not convert column '{column}' to {data_type}: {e}")
+                logger.warning("Could not convert column '%s' to %s: %s", column, data_type, e)
         
         return data
     
+    def _to_boolean(self, series: pd.Series) -> pd.Series:
+        """Convert a boolean-typed column to nullable booleans, keeping <NA>.
+        
+        Columns of 0/1 numbers (including '1.0' or 1.0) are compared as
+        numbers; the rest are mapped through the boolean vocabulary.
+        """
+        numeric = pd.to_numeric(series, errors='coerce')
+        if numeric.notna().sum() == series.notna().sum():
+            return numeric.eq(1).astype('boolean').mask(numeric.isna())
+        
+        present = series.notna().to_numpy()
+        values = np.zeros(len(series), dtype=bool)
+        values[present] = np.isin(self._lowered_strings(series), _TRUE_ARR)
+        return pd.Series(pd.arrays.BooleanArray(values, ~present), index=series.index, name=series.name)
+    
+    def _downcast_numeric(self, series: pd.Series) -> pd.Series:
+        """Store numeric values in the smallest dtype that holds them exactly."""
+        if series.notna().all() and (series % 1 == 0).all():
+            return pd.to_numeric(series, downcast='integer')
+        
+        as_float32 = series.astype('float32')
+        if np.array_equal(as_float32.to_numpy(), series.to_numpy(), equal_nan=True):
+            return as_float32
+        return series
+    
     def _apply_custom_rules(self, data: pd.DataFrame, custom_rules: Dict[str, Any]) -> pd.DataFrame:
         """Apply custom cleaning rules."""
         # This can be extended based on specific requirements
@@ -533,20 +799,36 @@ class DataProcessor(IDataProcessor):
     
     def _count_outliers(self, series: pd.Series) -> int:
         """Count outliers in a numeric series."""
-        if series.dtype not in [np.number]:
+        if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
             return 0
         
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
+        return self._count_outliers_array(series.to_numpy(dtype=float, na_value=np.nan).reshape(-1, 1))
+    
+    def _iqr_bounds(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute per-column IQR outlier bounds of a 2-D array in one pass."""
+        with warnings.catch_warnings():
+            # All-NaN columns simply get NaN bounds
+            warnings.simplefilter('ignore', RuntimeWarning)
+            Q1, Q3 = np.nanpercentile(values, [25, 75], axis=0)
         IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+    
+    def _count_outliers_array(self, values: np.ndarray) -> int:
+        """Count IQR outliers across all columns of a 2-D array."""
+        if values.size == 0:
+            return 0
         
-        return ((series < lower_bound) | (series > upper_bound)).sum()
+        lower_bound, upper_bound = self._iqr_bounds(values)
+        return int(((values < lower_bound) | (values > upper_bound)).sum())
     
-    def _calculate_validity_score(self, data: pd.DataFrame) -> float:
+    def _calculate_validity_score(self, data: pd.DataFrame,
+                                  detected_types: Optional[Dict[str, str]] = None) -> float:
         """Calculate validity score based on data type consistency."""
-        detected_types = self.detect_data_types(data)
+        cached = self._cache_get(self._type_cache, self._cache_key(data), data)
+        if detected_types is None:
+            detected_types, coerced_values = cached or self._detect_with_values(data)
+        else:
+            coerced_values = cached[1] if cached else {}
         valid_cells = 0
         total_cells = 0
         
@@ -555,7 +837,10 @@ class DataProcessor(IDataProcessor):
                 series = data[column].dropna()
                 total_cells += len(series)
                 
-                if expected_type == DataType.NUMERIC.value:
+                if column in coerced_values:
+                    # Values were already parsed during type detection
+                    valid_cells += coerced_values[column].notna().sum()
+                elif expected_type == DataType.NUMERIC.value:
                     valid_cells += pd.to_numeric(series, errors='coerce').notna().sum()
                 elif expected_type == DataType.DATETIME.value:
                     valid_cells += pd.to_datetime(series, errors='coerce').notna().sum()
@@ -9,23 +9,79 @@ from typing import Dict, Any, List, Optional, Tuple, Union
 import xlwings as xw
 import json
 import asyncio
+import functools
+from contextlib import contextmanager
 from datetime import datetime
 import logging
+import time
+import weakref
 
 from .interfaces import IExcelDataProvider, IExcelResultWriter, IExcelUIController
+from ..utils.compat import HAS_ORJSON, orjson
 from ..utils.config import PluginConfig
 
 
+# Number of results kept per custom function
+UDF_CACHE_SIZE = 1024
+
+# Rows per range assignment when writing large DataFrames
+WRITE_CHUNK_ROWS = 50_000
+
+# Rows per block when exporting DataFrames to CSV
+CSV_CHUNK_ROWS = 100_000
+
+# Progress updates to the status bar are limited to one per interval
+# (seconds) unless the message changes or progress moves by at least a step
+STATUS_MIN_INTERVAL = 0.2
+STATUS_MIN_PROGRESS_STEP = 0.01
+
+# Rows measured when sizing DataFrame columns, and Excel's maximum column
+# width in characters
+COLUMN_WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 255
+
+# Leading rows hashed to tell whether a cached DataFrame was edited in place
+FINGERPRINT_ROWS = 100
+
+if HAS_ORJSON:
+    _ORJSON_CELL_OPTIONS = (
+        orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
 class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController):
     """Main interface for Excel COM automation and data exchange."""
     
+    # Skip the correlation summary for frames with more numeric columns
+    CORRELATION_MAX_COLUMNS = 200
+    
     def __init__(self, config: PluginConfig):
         self.config = config
         self.app = None
         self.workbook = None
         self.custom_functions = {}
+        
+        # Proxies resolved once per connection; every attribute access on a
+        # COM object is another IDispatch round-trip
+        self._sheets = None
         self.logger = logging.getLogger(__name__)
         
+        # Lower-cased sheet names of the workbook, loaded on first use
+        self._known_sheets: Optional[set] = None
+        
+        # Layout of the last result write per (lower-cased) sheet name, used
+        # to skip clearing sheets that are about to be fully overwritten
+        self._last_written_bounds: Dict[str, Tuple[str, str, int, int]] = {}
+        
+        # Characteristics per live DataFrame: key -> (weakref to frame,
+        # fingerprint of its leading rows, result)
+        self._characteristics_cache: Dict[tuple, tuple] = {}
+        
+        # Last status bar text written and the progress update behind it
+        self._last_status: Optional[str] = None
+        self._last_progress: Optional[Tuple[str, float]] = None
+        self._last_status_ts = 0.0
+        
         # Initialize Excel connection
         self._initialize_excel_connection()
         
@@ -44,6 +100,8 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             except:
                 self.workbook = self.app.books.add()
             
+            self._sheets = self.workbook.sheets
+            
             self.logger.info("Excel connection established successfully")
             return True
             
@@ -54,53 +112,6 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
     def register_custom_functions(self) -> bool:
         """Register custom Excel functions (UDFs)."""
         try:
-            # Register OLLAMA_ANALYZE function
-            @xw.func
-            def OLLAMA_ANALYZE(range_ref: str, prompt: str = "Analyze this data") -> str:
-                """Custom Excel function for AI analysis."""
-                try:
-                    # Get data from range
-                    data = self.get_range_data(range_ref)
-                    if data is None:
-                        return "Error: Could not read data from range"
-                    
-                    # This would typically call the agent controller
-                    # For now, return a placeholder
-                    return f"Analysis of {data.shape[0]} rows, {data.shape[1]} columns: {prompt}"
-                    
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            
-            # Register AI_TREND function
-            @xw.func
-            def AI_TREND(data_range: str, periods: int = 10) -> str:
-                """Custom Excel function for trend analysis."""
-                try:
-                    data = self.get_range_data(data_range)
-                    if data is None:
-                        return "Error: Could not read data from range"
-                    
-                    # Placeholder for trend analysis
-                    return f"Trend forecast for {periods} periods based on {len(data)} data points"
-                    
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            
-            # Register PATTERN_DETECT function
-            @xw.func
-            def PATTERN_DETECT(range_ref: str, threshold: float = 0.5) -> str:
-                """Custom Excel function for pattern detection."""
-                try:
-                    data = self.get_range_data(range_ref)
-                    if data is None:
-                        return "Error: Could not read data from range"
-                    
-                    # Placeholder for pattern detection
-                    return f"Pattern detection with threshold {threshold} on {data.shape[0]} rows"
-                    
-                except Exception as e:
-                    return f"Error: {str(e)}"
-            
             # Store function references
             self.custom_functions = {
                 'OLLAMA_ANALYZE': OLLAMA_ANALYZE,
@@ -116,7 +127,11 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             return False
     
     def get_selected_range(self) -> Optional[pd.DataFrame]:
-        """Get data from currently selected Excel range."""
+        """Get data from currently selected Excel range.
+        
+        The selection is read from Excel on every call: it may be in any
+        open workbook and its cells may have been edited since the last click.
+        """
         try:
             if not self.app or not self.workbook:
                 return None
@@ -126,28 +141,7 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             if not selection:
                 return None
             
-            # Convert to pandas DataFrame
-            values = selection.value
-            if not values:
-                return None
-            
-            # Handle single cell
-            if not isinstance(values, list):
-                return pd.DataFrame([[values]])
-            
-            # Handle single row
-            if not isinstance(values[0], list):
-                return pd.DataFrame([values])
-            
-            # Handle multiple rows and columns
-            df = pd.DataFrame(values)
-            
-            # Try to use first row as headers if they look like strings
-            if df.iloc[0].dtype == 'object':
-                df.columns = df.iloc[0]
-                df = df.drop(df.index[0]).reset_index(drop=True)
-            
-            return df
+            return self._range_to_df(selection)
             
         except Exception as e:
             self.logger.error(f"Error getting selected range: {e}")
@@ -162,33 +156,11 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             # Parse range reference
             if '!' in range_ref:
                 sheet_name, cell_range = range_ref.split('!', 1)
-                sheet = self.workbook.sheets[sheet_name]
             else:
-                sheet = self.workbook.sheets.active
+                sheet_name = self._sheets.active.name
                 cell_range = range_ref
             
-            # Get range values
-            range_obj = sheet.range(cell_range)
-            values = range_obj.value
-            
-            if not values:
-                return None
-            
-            # Convert to DataFrame
-            if not isinstance(values, list):
-                return pd.DataFrame([[values]])
-            
-            if not isinstance(values[0], list):
-                return pd.DataFrame([values])
-            
-            df = pd.DataFrame(values)
-            
-            # Try to detect headers
-            if len(df) > 1 and df.iloc[0].dtype == 'object':
-                df.columns = df.iloc[0]
-                df = df.drop(df.index[0]).reset_index(drop=True)
-            
-            return df
+            return self._read_range(sheet_name, cell_range)
             
         except Exception as e:
             self.logger.error(f"Error getting range data: {e}")
@@ -200,34 +172,68 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             if not self.workbook:
                 return None
             
-            if sheet_name:
-                sheet = self.workbook.sheets[sheet_name]
-            else:
-                sheet = self.workbook.sheets.active
-            
-            # Get used range
-            used_range = sheet.used_range
-            if not used_range:
-                return None
-            
-            values = used_range.value
-            if not values:
-                return None
+            if not sheet_name:
+                sheet_name = self._sheets.active.name
             
-            # Convert to DataFrame
-            df = pd.DataFrame(values)
-            
-            # Use first row as headers if appropriate
-            if len(df) > 1 and df.iloc[0].dtype == 'object':
-                df.columns = df.iloc[0]
-                df = df.drop(df.index[0]).reset_index(drop=True)
-            
-            return df
+            return self._read_range(sheet_name, None)
             
         except Exception as e:
             self.logger.error(f"Error getting worksheet data: {e}")
             return None
     
+    def _read_range(self, sheet_name: str, cell_range: Optional[str]) -> Optional[pd.DataFrame]:
+        """Read a range (or the used range if ``cell_range`` is None) from Excel."""
+        sheet = self._sheets[sheet_name]
+        
+        if cell_range is None:
+            # Get used range
+            range_obj = sheet.used_range
+            if not range_obj:
+                return None
+        else:
+            range_obj = sheet.range(cell_range)
+        
+        return self._range_to_df(range_obj)
+    
+    def _range_to_df(self, range_obj) -> Optional[pd.DataFrame]:
+        """Convert an xlwings range to a DataFrame, detecting a header row."""
+        # Single cells and single rows come back as plain values
+        if range_obj.shape[0] == 1:
+            return self._rows_to_df(range_obj.value)
+        
+        # Let xlwings convert straight into a DataFrame, using the first
+        # row as headers
+        df = range_obj.options(pd.DataFrame, header=1, index=False, empty=np.nan).value
+        
+        # No string in the first row means it was data, not headers
+        if not any(isinstance(col, str) for col in df.columns):
+            first_row = pd.DataFrame([list(df.columns)])
+            df.columns = first_row.columns
+            df = pd.concat([first_row, df], ignore_index=True)
+        
+        return df
+    
+    @staticmethod
+    def _rows_to_df(values: Any) -> Optional[pd.DataFrame]:
+        """Convert a raw range value (scalar, row or list of rows) to a DataFrame."""
+        if not values:
+            return None
+        
+        # Handle single cell
+        if not isinstance(values, list):
+            return pd.DataFrame([[values]])
+        
+        # Handle single row
+        if not isinstance(values[0], list):
+            return pd.DataFrame([values])
+        
+        # Use the first row as headers if it holds strings; slicing avoids
+        # a drop/reset_index copy of the whole frame
+        if len(values) > 1 and any(isinstance(value, str) for value in values[0]):
+            return pd.DataFrame(values[1:], columns=values[0])
+        
+        return pd.DataFrame(values)
+    
     def write_results_to_sheet(self, data: Union[pd.DataFrame, Dict, List], 
                               sheet_name: str = "AI_Analysis_Results",
                               start_cell: str = "A1") -> bool:
@@ -236,29 +242,35 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             if not self.workbook:
                 return False
             
-            # Create or get sheet
-            try:
-                sheet = self.workbook.sheets[sheet_name]
-            except:
-                sheet = self.workbook.sheets.add(sheet_name)
-            
-            # Clear existing content
-            sheet.clear()
-            
-            # Handle different data types
-            if isinstance(data, pd.DataFrame):
-                self._write_dataframe_to_sheet(sheet, data, start_cell)
-            elif isinstance(data, dict):
-                self._write_dict_to_sheet(sheet, data, start_cell)
-            elif isinstance(data, list):
-                self._write_list_to_sheet(sheet, data, start_cell)
-            else:
-                # Convert to string and write
-                sheet.range(start_cell).value = str(data)
-            
-            # Auto-fit columns
-            sheet.autofit()
-            
+            with self._batch_mode():
+                # Create or get sheet
+                sheet = self._get_or_add_sheet(sheet_name)
+                
+                # Clear existing content, unless our previous write to this
+                # sheet had the same layout and is fully covered by this one
+                bounds = self._write_bounds(data, start_cell)
+                previous = self._last_written_bounds.get(sheet_name.lower())
+                if not self._covers(bounds, previous):
+                    sheet.clear()
+                self._last_written_bounds[sheet_name.lower()] = bounds
+                
+                # Handle different data types; DataFrame columns are sized
+                # from the frame itself rather than measured by Excel
+                if isinstance(data, pd.DataFrame):
+                    self._write_dataframe_to_sheet(sheet, data, start_cell)
+                    self._set_column_widths(sheet, data, start_cell)
+                else:
+                    if isinstance(data, dict):
+                        self._write_dict_to_sheet(sheet, data, start_cell)
+                    elif isinstance(data, list):
+                        self._write_list_to_sheet(sheet, data, start_cell)
+                    else:
+                        # Convert to string and write
+                        sheet.range(start_cell).value = str(data)
+                    
+                    # Auto-fit columns
+                    sheet.autofit()
+                
             self.logger.info(f"Results written to sheet '{sheet_name}' successfully")
             return True
             
@@ -266,6 +278,48 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             self.logger.error(f"Error writing results to sheet: {e}")
             return False
     
+    @staticmethod
+    def _write_bounds(data: Any, start_cell: str) -> Tuple[str, str, int, int]:
+        """Layout of a result write: (kind, start cell, rows, columns)."""
+        if isinstance(data, pd.DataFrame):
+            return 'frame', start_cell, len(data) + 1, len(data.columns)
+        if isinstance(data, dict):
+            return 'dict', start_cell, len(data), 2
+        if isinstance(data, list):
+            return 'list', start_cell, len(data), 1
+        return 'value', start_cell, 1, 1
+    
+    @staticmethod
+    def _covers(bounds: Tuple[str, str, int, int],
+                previous: Optional[Tuple[str, str, int, int]]) -> bool:
+        """Whether a write overwrites every cell and format of the previous one."""
+        if previous is None:
+            return False
+        kind, start_cell, rows, cols = bounds
+        prev_kind, prev_start_cell, prev_rows, prev_cols = previous
+        return (kind == prev_kind and start_cell == prev_start_cell
+                and rows >= prev_rows and cols >= prev_cols)
+    
+    def _get_or_add_sheet(self, sheet_name: str):
+        """Get a worksheet by name, adding it if the workbook doesn't have it.
+        
+        Sheet names are tracked in a set so the common case needs no failing
+        COM lookup. A sheet removed behind our back is re-added.
+        """
+        if self._known_sheets is None:
+            self._known_sheets = {name.lower() for name in self.workbook.sheet_names}
+        
+        key = sheet_name.lower()
+        if key in self._known_sheets:
+            try:
+                return self._sheets[sheet_name]
+            except Exception:
+                self._known_sheets.discard(key)
+        
+        sheet = self._sheets.add(sheet_name)
+        self._known_sheets.add(key)
+        return sheet
+    
     def create_visualization(self, chart_type: str, data: pd.DataFrame, 
                            sheet_name: str = "AI_Charts") -> bool:
         """Create visualization in Excel."""
@@ -273,42 +327,36 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             if not self.workbook or data.empty:
                 return False
             
-            # Create or get chart sheet
-            try:
-                sheet = self.workbook.sheets[sheet_name]
-            except:
-                sheet = self.workbook.sheets.add(sheet_name)
-            
-            # Write data to sheet first
-            data_range = sheet.range('A1').resize(data.shape[0] + 1, data.shape[1])
-            
-            # Write headers
-            sheet.range('A1').resize(1, data.shape[1]).value = list(data.columns)
-            
-            # Write data
-            sheet.range('A2').resize(data.shape[0], data.shape[1]).value = data.values
-            
-            # Create chart
-            chart = sheet.charts.add()
-            chart.set_source_data(data_range)
-            
-            # Set chart type
-            chart_types = {
-                'line': xw.constants.ChartType.xlLine,
-                'bar': xw.constants.ChartType.xlColumnClustered,
-                'scatter': xw.constants.ChartType.xlXYScatter,
-                'pie': xw.constants.ChartType.xlPie
-            }
-            
-            if chart_type.lower() in chart_types:
-                chart.chart_type = chart_types[chart_type.lower()]
-            
-            # Position chart
-            chart.top = sheet.range('A1').top + 200
-            chart.left = sheet.range('A1').left
-            chart.width = 400
-            chart.height = 300
-            
+            with self._batch_mode():
+                # Create or get chart sheet
+                sheet = self._get_or_add_sheet(sheet_name)
+                
+                # Write headers and data to sheet first, in one assignment
+                anchor = sheet.range('A1')
+                data_range = anchor.resize(data.shape[0] + 1, data.shape[1])
+                data_range.value = [list(data.columns)] + self._to_cell_rows(data, self._has_native_values(data))
+                
+                # Create chart
+                chart = sheet.charts.add()
+                chart.set_source_data(data_range)
+                
+                # Set chart type
+                chart_types = {
+                    'line': xw.constants.ChartType.xlLine,
+                    'bar': xw.constants.ChartType.xlColumnClustered,
+                    'scatter': xw.constants.ChartType.xlXYScatter,
+                    'pie': xw.constants.ChartType.xlPie
+                }
+                
+                if chart_type.lower() in chart_types:
+                    chart.chart_type = chart_types[chart_type.lower()]
+                
+                # Position chart
+                chart.top = anchor.top + 200
+                chart.left = anchor.left
+                chart.width = 400
+                chart.height = 300
+                
             self.logger.info(f"Chart created successfully in sheet '{sheet_name}'")
             return True
             
@@ -316,13 +364,30 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             self.logger.error(f"Error creating visualization: {e}")
             return False
     
+    @contextmanager
+    def _batch_mode(self):
+        """Suspend screen updates, recalculation and alerts during bulk writes."""
+        if not self.app:
+            yield
+            return
+        
+        app = self.app
+        saved = (app.screen_updating, app.calculation, app.display_alerts)
+        app.screen_updating = False
+        app.calculation = 'manual'
+        app.display_alerts = False
+        try:
+            yield
+        finally:
+            app.screen_updating, app.calculation, app.display_alerts = saved
+    
     def update_ribbon_status(self, status: str) -> bool:
         """Update status in Excel ribbon."""
         try:
             # This would typically update a custom ribbon control
             # For now, we'll use the status bar
             if self.app:
-                self.app.status_bar = f"Ollama AI Plugin: {status}"
+                self._set_status_bar(f"Ollama AI Plugin: {status}")
                 return True
             return False
             
@@ -331,11 +396,24 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             return False
     
     def show_progress_indicator(self, message: str, progress: float = 0) -> bool:
-        """Show progress indicator to user."""
+        """Show progress indicator to user.
+        
+        Updates for the same message are rate-limited so agents reporting
+        progress in a tight loop don't flood Excel with COM calls.
+        """
         try:
             if self.app:
+                now = time.monotonic()
+                last = self._last_progress
+                if (last is not None and last[0] == message
+                        and now - self._last_status_ts < STATUS_MIN_INTERVAL
+                        and abs(progress - last[1]) < STATUS_MIN_PROGRESS_STEP):
+                    return True
+                
                 status_msg = f"{message} ({progress:.0%})" if progress > 0 else message
-                self.app.status_bar = status_msg
+                self._set_status_bar(status_msg)
+                self._last_progress = (message, progress)
+                self._last_status_ts = now
                 return True
             return False
             
@@ -343,11 +421,18 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             self.logger.error(f"Error showing progress indicator: {e}")
             return False
     
+    def _set_status_bar(self, text: str):
+        """Write ``text`` to the status bar unless it is already showing."""
+        if text != self._last_status:
+            self.app.status_bar = text
+            self._last_status = text
+        self._last_progress = None
+    
     def hide_progress_indicator(self) -> bool:
         """Hide progress indicator."""
         try:
             if self.app:
-                self.app.status_bar = "Ready"
+                self._set_status_bar("Ready")
                 return True
             return False
             
@@ -355,19 +440,44 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             self.logger.error(f"Error hiding progress indicator: {e}")
             return False
     
-    def get_data_characteristics(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Analyze data characteristics for visualization recommendations."""
+    def get_data_characteristics(self, data: pd.DataFrame,
+                                 include_duplicates: bool = False) -> Dict[str, Any]:
+        """Analyze data characteristics for visualization recommendations.
+        
+        Counting duplicate rows hashes every row, so ``duplicate_rows`` is only
+        reported when ``include_duplicates`` is set. Results are cached for as
+        long as the DataFrame is alive and its leading rows are unchanged.
+        """
         try:
+            key = (id(data), data.shape, include_duplicates)
+            fingerprint = self._fingerprint(data)
+            entry = self._characteristics_cache.get(key)
+            if (entry is not None and entry[0]() is data
+                    and fingerprint is not None and entry[1] == fingerprint):
+                return dict(entry[2])
+            
+            # Bucket columns by dtype in a single scan
+            dtypes = data.dtypes
+            numeric_columns, categorical_columns, datetime_columns = [], [], []
+            for column, dtype in dtypes.items():
+                if dtype.kind == 'M':
+                    datetime_columns.append(column)
+                elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                    categorical_columns.append(column)
+                elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                    numeric_columns.append(column)
+            
             characteristics = {
                 'shape': data.shape,
-                'data_types': data.dtypes.to_dict(),
-                'numeric_columns': data.select_dtypes(include=[np.number]).columns.tolist(),
-                'categorical_columns': data.select_dtypes(include=['object']).columns.tolist(),
-                'datetime_columns': data.select_dtypes(include=['datetime64']).columns.tolist(),
+                'data_types': dtypes.to_dict(),
+                'numeric_columns': numeric_columns,
+                'categorical_columns': categorical_columns,
+                'datetime_columns': datetime_columns,
                 'has_time_series': False,
-                'missing_values': data.isnull().sum().sum(),
-                'duplicate_rows': data.duplicated().sum()
+                'missing_values': self._count_missing(data)
             }
+            if include_duplicates:
+                characteristics['duplicate_rows'] = data.duplicated().sum()
             
             # Check for time series data
             datetime_cols = characteristics['datetime_columns']
@@ -378,76 +488,186 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
                 time_col = datetime_cols[0]
                 time_series = data[time_col].dropna()
                 if len(time_series) > 1:
-                    time_diff = time_series.diff().median()
-                    characteristics['time_frequency'] = str(time_diff)
+                    # tz-aware columns become object arrays in to_numpy();
+                    # step through them as naive UTC instead
+                    naive = time_series.dt.tz_convert(None) if time_series.dt.tz is not None else time_series
+                    values = naive.to_numpy()
+                    unit = np.datetime_data(values.dtype)[0]
+                    median_step = np.median(np.diff(values.view('i8')))
+                    characteristics['time_frequency'] = str(pd.Timedelta(median_step, unit=unit))
                     characteristics['time_range'] = {
                         'start': time_series.min(),
                         'end': time_series.max()
                     }
             
             # Analyze numeric data distribution
-            numeric_data = data.select_dtypes(include=[np.number])
+            numeric_data = data[numeric_columns]
             if not numeric_data.empty:
                 characteristics['numeric_stats'] = {
                     'mean_values': numeric_data.mean().to_dict(),
                     'std_values': numeric_data.std().to_dict(),
-                    'correlation_strength': abs(numeric_data.corr()).mean().mean() if len(numeric_data.columns) > 1 else 0
+                    'correlation_strength': self._correlation_strength(numeric_data)
                 }
             
-            return characteristics
+            cache = self._characteristics_cache
+            cache[key] = (weakref.ref(data, lambda _: cache.pop(key, None)), fingerprint, characteristics)
+            return dict(characteristics)
             
         except Exception as e:
             self.logger.error(f"Error analyzing data characteristics: {e}")
             return {}
     
+    @staticmethod
+    def _fingerprint(data: pd.DataFrame) -> Optional[int]:
+        """Hash of the first ``FINGERPRINT_ROWS`` rows, or None if unhashable."""
+        try:
+            head = data.iloc[:FINGERPRINT_ROWS]
+            return int(pd.util.hash_pandas_object(head, index=False).sum())
+        except TypeError:
+            return None
+    
+    def _count_missing(self, data: pd.DataFrame) -> int:
+        """Count missing cells in one pass over the frame's values."""
+        values = data.to_numpy()
+        if values.dtype.kind in 'biu':
+            return 0
+        if values.dtype.kind == 'f':
+            return int(np.isnan(values).sum())
+        return int(pd.isna(values).sum())
+    
+    def _correlation_strength(self, numeric_data: pd.DataFrame) -> Optional[float]:
+        """Mean absolute Pearson correlation across all numeric column pairs.
+        
+        Returns None for frames wider than ``CORRELATION_MAX_COLUMNS``.
+        """
+        n_columns = len(numeric_data.columns)
+        if n_columns <= 1:
+            return 0
+        if n_columns > self.CORRELATION_MAX_COLUMNS:
+            return None
+        
+        values = numeric_data.to_numpy(dtype=float)
+        if len(values) < 2:
+            return np.nan
+        if np.isnan(values).any():
+            # Pairwise-complete correlation needs pandas' NaN handling
+            return abs(numeric_data.corr()).mean().mean()
+        
+        # Constant columns have no defined correlation; pandas leaves them NaN
+        # and skips them in the mean
+        std = values.std(axis=0, ddof=1)
+        varying = std > 0
+        if not varying.any():
+            return np.nan
+        values = values[:, varying]
+        
+        # Standardize once, then the whole correlation matrix is one GEMM
+        z = (values - values.mean(axis=0)) / std[varying]
+        corr = (z.T @ z) / (len(z) - 1)
+        return float(np.abs(corr).mean())
+    
     def _write_dataframe_to_sheet(self, sheet, data: pd.DataFrame, start_cell: str):
         """Write DataFrame to Excel sheet."""
-        # Write headers
-        header_range = sheet.range(start_cell).resize(1, len(data.columns))
-        header_range.value = list(data.columns)
-        header_range.font.bold = True
-        
-        # Write data
-        if not data.empty:
-            start_row = sheet.range(start_cell).row + 1
-            start_col = sheet.range(start_cell).column
-            data_range = sheet.range((start_row, start_col)).resize(len(data), len(data.columns))
-            data_range.value = data.values
+        # Headers and data go out in as few range assignments as possible;
+        # every separate range access is another COM round-trip. Large frames
+        # are written in row blocks to bound the size of each SAFEARRAY.
+        anchor = sheet.range(start_cell)
+        n_columns = len(data.columns)
+        native = self._has_native_values(data)
+        
+        payload = [list(data.columns)] + self._to_cell_rows(data.iloc[:WRITE_CHUNK_ROWS], native)
+        anchor.resize(len(payload), n_columns).value = payload
+        
+        for start in range(WRITE_CHUNK_ROWS, len(data), WRITE_CHUNK_ROWS):
+            chunk = self._to_cell_rows(data.iloc[start:start + WRITE_CHUNK_ROWS], native)
+            anchor.offset(row_offset=start + 1).resize(len(chunk), n_columns).value = chunk
+        
+        anchor.resize(1, n_columns).font.bold = True
+    
+    @staticmethod
+    def _column_widths(data: pd.DataFrame) -> List[int]:
+        """Column widths in characters: longest header or cell text plus padding.
+        
+        Only the first ``COLUMN_WIDTH_SAMPLE_ROWS`` rows are measured.
+        """
+        sample = data.iloc[:COLUMN_WIDTH_SAMPLE_ROWS]
+        widths = []
+        for i, column in enumerate(data.columns):
+            cells = sample.iloc[:, i]
+            longest = int(cells.astype(str).str.len().max()) if len(cells) else 0
+            widths.append(min(max(len(str(column)), longest) + 2, MAX_COLUMN_WIDTH))
+        return widths
+    
+    def _set_column_widths(self, sheet, data: pd.DataFrame, start_cell: str):
+        """Size the columns of a written DataFrame without an Excel autofit.
+        
+        Adjacent columns of equal width share one range assignment.
+        """
+        anchor = sheet.range(start_cell)
+        widths = self._column_widths(data)
+        start = 0
+        for end in range(1, len(widths) + 1):
+            if end == len(widths) or widths[end] != widths[start]:
+                anchor.offset(column_offset=start).resize(1, end - start).column_width = widths[start]
+                start = end
+    
+    @staticmethod
+    def _has_native_values(data: pd.DataFrame) -> bool:
+        """Whether all columns are plain NumPy bool/int/float columns."""
+        return all(isinstance(dtype, np.dtype) and dtype.kind in 'biuf' for dtype in data.dtypes)
+    
+    @staticmethod
+    def _to_cell_rows(block: pd.DataFrame, native: bool) -> List[list]:
+        """Convert DataFrame rows to lists of plain Python values for COM.
+        
+        Passing NumPy arrays makes pywin32 box every cell on its own; plain
+        lists skip that. Datetime and nullable columns go through object
+        dtype so timestamps stay timestamps and pd.NA/NaT become empty cells.
+        """
+        if native:
+            return block.to_numpy().tolist()
+        return block.astype(object).where(block.notna(), None).to_numpy().tolist()
     
     def _write_dict_to_sheet(self, sheet, data: Dict, start_cell: str):
         """Write dictionary to Excel sheet."""
-        row = sheet.range(start_cell).row
-        col = sheet.range(start_cell).column
+        if not data:
+            return
         
-        for key, value in data.items():
-            # Write key
-            sheet.range((row, col)).value = str(key)
-            sheet.range((row, col)).font.bold = True
-            
-            # Write value
-            if isinstance(value, (dict, list)):
-                sheet.range((row, col + 1)).value = json.dumps(value, indent=2)
-            else:
-                sheet.range((row, col + 1)).value = str(value)
-            
-            row += 1
+        rows = [[str(key), self._format_cell_value(value)] for key, value in data.items()]
+        
+        # One assignment for all key/value pairs, one call to bold the keys
+        anchor = sheet.range(start_cell)
+        anchor.resize(len(rows), 2).value = rows
+        anchor.resize(len(rows), 1).font.bold = True
     
     def _write_list_to_sheet(self, sheet, data: List, start_cell: str):
         """Write list to Excel sheet."""
-        row = sheet.range(start_cell).row
-        col = sheet.range(start_cell).column
+        if not data:
+            return
         
-        for i, item in enumerate(data):
-            if isinstance(item, (dict, list)):
-                sheet.range((row + i, col)).value = json.dumps(item, indent=2)
-            else:
-                sheet.range((row + i, col)).value = str(item)
+        sheet.range(start_cell).resize(len(data), 1).value = [
+            [self._format_cell_value(item)] for item in data
+        ]
+    
+    @staticmethod
+    def _format_cell_value(value: Any) -> str:
+        """Serialize a value for a single Excel cell."""
+        if isinstance(value, (dict, list)):
+            if HAS_ORJSON:
+                try:
+                    return orjson.dumps(value, option=_ORJSON_CELL_OPTIONS).decode()
+                except TypeError:
+                    pass
+            return json.dumps(value, indent=2)
+        return str(value)
     
     def refresh_data(self) -> bool:
         """Refresh data connections and calculations."""
         try:
             if self.workbook:
-                self.workbook.app.calculate()
+                self.app.calculate()
+                self._known_sheets = None
+                self._last_written_bounds.clear()
                 return True
             return False
             
@@ -464,19 +684,20 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
                 filename = f"ollama_analysis_{timestamp}.{export_format}"
             
             if export_format.lower() == 'xlsx':
-                # Create new workbook for export
-                export_wb = self.app.books.add()
-                
-                if isinstance(data, pd.DataFrame):
-                    self._write_dataframe_to_sheet(export_wb.sheets[0], data, 'A1')
-                elif isinstance(data, dict):
-                    self._write_dict_to_sheet(export_wb.sheets[0], data, 'A1')
-                
-                export_wb.save(filename)
-                export_wb.close()
-                
+                with self._batch_mode():
+                    # Create new workbook for export
+                    export_wb = self.app.books.add()
+                    
+                    if isinstance(data, pd.DataFrame):
+                        self._write_dataframe_to_sheet(export_wb.sheets[0], data, 'A1')
+                    elif isinstance(data, dict):
+                        self._write_dict_to_sheet(export_wb.sheets[0], data, 'A1')
+                    
+                    export_wb.save(filename)
+                    export_wb.close()
+                    
             elif export_format.lower() == 'csv' and isinstance(data, pd.DataFrame):
-                data.to_csv(filename, index=False)
+                self._export_csv(data, filename)
                 
             self.logger.info(f"Results exported to {filename}")
             return True
@@ -485,6 +706,14 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
             self.logger.error(f"Error exporting results: {e}")
             return False
     
+    def _export_csv(self, data: pd.DataFrame, filename: str):
+        """Write a DataFrame to CSV in row blocks to bound peak memory."""
+        for start in range(0, max(len(data), 1), CSV_CHUNK_ROWS):
+            first = start == 0
+            data.iloc[start:start + CSV_CHUNK_ROWS].to_csv(
+                filename, index=False, header=first, mode='w' if first else 'a'
+            )
+    
     def cleanup(self):
         """Clean up Excel connections and resources."""
         try:
@@ -492,12 +721,88 @@ class ExcelInterface(IExcelDataProvider, IExcelResultWriter, IExcelUIController)
                 # Don't close the Excel app, just clean up references
                 self.app = None
                 self.workbook = None
+                self._sheets = None
+                self._known_sheets = None
+                self._last_written_bounds.clear()
                 self.logger.info("Excel interface cleaned up")
                 
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
 
 
+# Custom functions take their input as a range argument, so Excel's
+# dependency tracking recalculates them when those cells change. Results are
+# cached on the cell values (as tuples of row tuples), so Goal Seek / What-If
+# recalcs with identical inputs are not recomputed. Failures raise instead of
+# returning, so they are not cached.
+def _udf_key(values: Any) -> tuple:
+    """Hashable form of a 2-D range value."""
+    return tuple(map(tuple, values or ()))
+
+
+def _udf_data(values: tuple) -> pd.DataFrame:
+    """Convert a cached range value back into a DataFrame."""
+    data = ExcelInterface._rows_to_df([list(row) for row in values])
+    if data is None:
+        raise ValueError("Could not read data from range")
+    return data
+
+
+@functools.lru_cache(maxsize=UDF_CACHE_SIZE)
+def _analyze(values: tuple, prompt: str) -> str:
+    data = _udf_data(values)
+    
+    # This would typically call the agent controller
+    # For now, return a placeholder
+    return f"Analysis of {data.shape[0]} rows, {data.shape[1]} columns: {prompt}"
+
+
+@functools.lru_cache(maxsize=UDF_CACHE_SIZE)
+def _trend(values: tuple, periods: int) -> str:
+    data = _udf_data(values)
+    
+    # Placeholder for trend analysis
+    return f"Trend forecast for {periods} periods based on {len(data)} data points"
+
+
+@functools.lru_cache(maxsize=UDF_CACHE_SIZE)
+def _detect_patterns(values: tuple, threshold: float) -> str:
+    data = _udf_data(values)
+    
+    # Placeholder for pattern detection
+    return f"Pattern detection with threshold {threshold} on {data.shape[0]} rows"
+
+
+@xw.func(volatile=False)
+@xw.arg('range_ref', ndim=2)
+def OLLAMA_ANALYZE(range_ref: List[list], prompt: str = "Analyze this data") -> str:
+    """Custom Excel function for AI analysis."""
+    try:
+        return _analyze(_udf_key(range_ref), prompt)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@xw.func(volatile=False)
+@xw.arg('data_range', ndim=2)
+def AI_TREND(data_range: List[list], periods: int = 10) -> str:
+    """Custom Excel function for trend analysis."""
+    try:
+        return _trend(_udf_key(data_range), periods)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@xw.func(volatile=False)
+@xw.arg('range_ref', ndim=2)
+def PATTERN_DETECT(range_ref: List[list], threshold: float = 0.5) -> str:
+    """Custom Excel function for pattern detection."""
+    try:
+        return _detect_patterns(_udf_key(range_ref), threshold)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
 class ExcelFunctionRegistry:
     """Registry for custom Excel functions."""
     
@@ -8,6 +8,7 @@ from typing import Dict, Any, List, Optional, Iterator
 import pandas as pd
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from enum import Enum
 
 
@@ -52,6 +53,24 @@ class AnalysisResult:
     timestamp: datetime
 
 
+@dataclass(eq=False)
+class DataInfo:
+    """Lazily computed shape and column names of a DataFrame."""
+    df: pd.DataFrame
+    
+    @cached_property
+    def rows(self) -> int:
+        return len(self.df)
+    
+    @cached_property
+    def columns(self) -> int:
+        return len(self.df.columns)
+    
+    @cached_property
+    def column_names(self) -> List[Any]:
+        return self.df.columns.tolist()
+
+
 @dataclass
 class ValidationResult:
     """Result of data validation operations."""
@@ -134,7 +153,7 @@ class IDataProcessor(ABC):
         pass
     
     @abstractmethod
-    def chunk_large_dataset(self, data: pd.DataFrame) -> Iterator[pd.DataFrame]:
+    def chunk_large_dataset(self, data: pd.DataFrame, copy: bool = False) -> Iterator[pd.DataFrame]:
         """Split large dataset into manageable chunks."""
         pass
 
@@ -4,17 +4,110 @@ Handles communication with Ollama server and model management.
 """
 
 import asyncio
+import atexit
 import json
+import random
 import time
-from typing import Dict, List, Optional, Any, AsyncIterator
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, AsyncIterator
 import aiohttp
 import requests
 from dataclasses import dataclass
 from enum import Enum
 
 from .interfaces import IOllamaClient
+from ..utils.compat import DATACLASS_SLOTS, HAS_ORJSON, orjson
 from ..utils.config import config_manager
 
+# Both accept raw bytes, so streamed lines are parsed without decoding first
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _json_dumps(payload: Any) -> bytes:
+    """Encode a request payload as JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode()
+
+
+def _encode_json_body(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace a ``json=`` request argument with a pre-encoded body."""
+    if 'json' not in kwargs:
+        return kwargs
+    kwargs = dict(kwargs)
+    kwargs['data'] = _json_dumps(kwargs.pop('json'))
+    kwargs['headers'] = {**_JSON_HEADERS, **kwargs.get('headers', {})}
+    return kwargs
+
+
+# Generate requests queued within this window (seconds) are dispatched
+# together, up to the batch size
+GENERATE_BATCH_WINDOW = 0.005
+GENERATE_BATCH_SIZE = 8
+
+# Model options accepted by configure_model_parameters
+_VALID_MODEL_PARAMS = frozenset({
+    'temperature', 'top_p', 'top_k', 'num_predict',
+    'num_ctx', 'repeat_penalty', 'seed'
+})
+
+# Deterministic generations kept per client, and how long (seconds) cached
+# generations, the model list and the server info stay valid
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 300
+MODELS_CACHE_TTL = 30
+SERVER_INFO_CACHE_TTL = 300
+
+# Seconds an idle pooled connection to the server is kept open; Excel use
+# is bursty, with pauses between prompts longer than aiohttp's default
+CONNECTION_KEEPALIVE = 300
+
+# Bytes read per block from streamed responses
+STREAM_READ_SIZE = 8192
+
+# Bounds (seconds) of the jittered delay between request retries
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+# Clients with a session that may still be open at interpreter exit
+_live_clients: "weakref.WeakSet[OllamaClient]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_clients():
+    """Schedule ``close()`` for open clients if an event loop is still running."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for client in list(_live_clients):
+        loop.create_task(client.close())
+
+
+def _parse_stream_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one NDJSON line of a stream, or None if blank or malformed."""
+    if not line.strip():
+        return None
+    try:
+        return _json_loads(line)
+    except ValueError:
+        return None
+
+
+def _next_backoff(previous: float) -> float:
+    """Decorrelated jitter: a random delay of up to three times the last one.
+    
+    Randomizing the delay keeps concurrent callers that failed together
+    from retrying in lockstep.
+    """
+    return min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, previous * 3))
+
 
 class ModelStatus(Enum):
     """Status of model loading/availability."""
@@ -24,7 +117,7 @@ class ModelStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ModelInfo:
     """Information about an Ollama model."""
     name: str
@@ -34,7 +127,7 @@ class ModelInfo:
     status: ModelStatus = ModelStatus.UNKNOWN
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class GenerationRequest:
     """Request structure for text generation."""
     model: str
@@ -45,39 +138,52 @@ class GenerationRequest:
 
 
 class CircuitBreaker:
-    """Circuit breaker pattern for handling API failures."""
+    """Circuit breaker pattern for handling API failures.
+    
+    State is kept as one ``(state, failure_count, last_failure_time)`` tuple
+    that is read once and replaced whole, so interleaved callers always see
+    a consistent snapshot.
+    """
+    
+    __slots__ = ('failure_threshold', 'recovery_timeout', '_state')
     
     def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
-        self.failure_count = 0
-        self.last_failure_time = 0
-        self.state = "closed"  # closed, open, half-open
+        self._state = ("closed", 0, 0.0)  # state is closed, open or half-open
+    
+    @property
+    def state(self) -> str:
+        return self._state[0]
+    
+    @property
+    def failure_count(self) -> int:
+        return self._state[1]
+    
+    @property
+    def last_failure_time(self) -> float:
+        return self._state[2]
     
     def can_execute(self) -> bool:
         """Check if request can be executed."""
-        if self.state == "closed":
+        state, failure_count, last_failure_time = self._state
+        if state != "open":
             return True
-        elif self.state == "open":
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = "half-open"
-                return True
-            return False
-        else:  # half-open
+        if time.monotonic() - last_failure_time > self.recovery_timeout:
+            self._state = ("half-open", failure_count, last_failure_time)
             return True
+        return False
     
     def record_success(self):
         """Record successful request."""
-        self.failure_count = 0
-        self.state = "closed"
+        self._state = ("closed", 0, 0.0)
     
     def record_failure(self):
         """Record failed request."""
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
+        state, failure_count, _ = self._state
+        failure_count += 1
+        state = "open" if failure_count >= self.failure_threshold else state
+        self._state = (state, failure_count, time.monotonic())
 
 
 class OllamaClient(IOllamaClient):
@@ -90,117 +196,217 @@ class OllamaClient(IOllamaClient):
         self.timeout = config.ollama.timeout
         self.max_retries = config.ollama.max_retries
         self.stream_responses = config.ollama.stream_responses
+        self.max_connections = config.ollama.max_connections
         
         self.current_model: Optional[str] = None
         self.model_config: Dict[str, Any] = config.ollama.model_parameters.copy()
+        self._model_config_view = MappingProxyType(self.model_config)
         self.available_models: Dict[str, ModelInfo] = {}
         
         # Circuit breaker for handling failures
         self.circuit_breaker = CircuitBreaker()
         
-        # Session for async requests
+        # Sessions for async and sync requests, each pooling its connections
         self._session: Optional[aiohttp.ClientSession] = None
+        self._sync_session: Optional[requests.Session] = None
+        
+        # Caps generate requests in flight so fan-out across many cells
+        # queues here instead of overloading the server. The semaphore is
+        # created on the loop that first uses it, which may run on another
+        # thread than the one constructing the client.
+        self.max_concurrent_generations = config.ollama.max_concurrent_generations or 4
+        self._gen_sem: Optional[asyncio.Semaphore] = None
+        self._gen_sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Non-streamed generate requests are queued and dispatched in small
+        # batches by a background task bound to the running event loop
+        self._req_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_runs: set = set()
+        
+        # Response caches: key -> (expiry, response text) in LRU order, plus
+        # single (expiry, value) slots for the model list and server info
+        self._cache: OrderedDict = OrderedDict()
+        self._models_cache: Optional[tuple] = None
+        self._server_info_cache: Optional[tuple] = None
+        
+        # Futures of non-streamed generations in flight, by request key
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+    
+    @property
+    def base_url(self) -> str:
+        """Server URL; setting it rebuilds the endpoint URLs."""
+        return self._base_url
+    
+    @base_url.setter
+    def base_url(self, value: str):
+        self._base_url = value
+        base = value.rstrip('/')
+        self._url_generate = f"{base}/api/generate"
+        self._url_tags = f"{base}/api/tags"
+        self._url_show = f"{base}/api/show"
+        self._url_pull = f"{base}/api/pull"
+        self._url_delete = f"{base}/api/delete"
+        self._url_version = f"{base}/api/version"
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
+        """Get or create aiohttp session.
+        
+        All requests go to one server, so the whole connection pool is
+        available to that host and idle connections are kept alive between
+        prompts.
+        """
         if self._session is None or self._session.closed:
             timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=CONNECTION_KEEPALIVE,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            _live_clients.add(self)
         return self._session
     
     async def close(self):
         """Close the client session."""
+        _live_clients.discard(self)
+        if self._batch_task is not None and not self._batch_task.done():
+            self._batch_task.cancel()
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+    
+    async def __aenter__(self) -> "OllamaClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
     
-    def _make_sync_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def _make_sync_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """Make synchronous HTTP request with retry logic."""
-        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-        
+        delay = RETRY_BASE_DELAY
         for attempt in range(self.max_retries + 1):
             try:
                 if not self.circuit_breaker.can_execute():
                     raise Exception("Circuit breaker is open")
                 
-                response = requests.request(
+                if self._sync_session is None:
+                    self._sync_session = requests.Session()
+                response = self._sync_session.request(
                     method, url, timeout=self.timeout, **kwargs
                 )
                 
-                if response.status_code == 200:
-                    self.circuit_breaker.record_success()
-                    return response
-                else:
-                    response.raise_for_status()
+                response.raise_for_status()
+                self.circuit_breaker.record_success()
+                return response
                     
             except Exception as e:
                 self.circuit_breaker.record_failure()
                 if attempt == self.max_retries:
                     raise e
                 
-                # Exponential backoff
-                wait_time = 2 ** attempt
-                time.sleep(wait_time)
+                # Jittered exponential backoff
+                delay = _next_backoff(delay)
+                time.sleep(delay)
         
         raise Exception(f"Failed to make request after {self.max_retries + 1} attempts")
     
-    async def _make_async_request(self, method: str, endpoint: str, **kwargs) -> aiohttp.ClientResponse:
-        """Make asynchronous HTTP request with retry logic."""
-        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+    async def _request_json(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        """Make asynchronous HTTP request with retry logic.
+        
+        The body is read while the connection is held and returned as parsed
+        JSON (an empty dict for an empty body), so the connection goes back
+        to the session's pool as soon as the request completes. A ``json=``
+        payload is encoded once up front, with orjson when available.
+        """
+        kwargs = _encode_json_body(kwargs)
         session = await self._get_session()
         
+        delay = RETRY_BASE_DELAY
         for attempt in range(self.max_retries + 1):
             try:
                 if not self.circuit_breaker.can_execute():
                     raise Exception("Circuit breaker is open")
                 
                 async with session.request(method, url, **kwargs) as response:
-                    if response.status == 200:
-                        self.circuit_breaker.record_success()
-                        return response
-                    else:
-                        response.raise_for_status()
+                    response.raise_for_status()
+                    body = await response.read()
+                
+                self.circuit_breaker.record_success()
+                return _json_loads(body) if body.strip() else {}
                         
             except Exception as e:
                 self.circuit_breaker.record_failure()
                 if attempt == self.max_retries:
                     raise e
                 
-                # Exponential backoff
-                wait_time = 2 ** attempt
-                await asyncio.sleep(wait_time)
+                # Jittered exponential backoff
+                delay = _next_backoff(delay)
+                await asyncio.sleep(delay)
         
         raise Exception(f"Failed to make request after {self.max_retries + 1} attempts")
     
+    @asynccontextmanager
+    async def _request_stream(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Open a streaming request and yield the live response.
+        
+        The connection is released back to the pool when the block exits.
+        Streams are not retried, since part of the body may already have
+        been consumed when a failure occurs.
+        """
+        if not self.circuit_breaker.can_execute():
+            raise Exception("Circuit breaker is open")
+        
+        kwargs = _encode_json_body(kwargs)
+        session = await self._get_session()
+        
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                response.raise_for_status()
+                self.circuit_breaker.record_success()
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.circuit_breaker.record_failure()
+            raise
+    
     def test_connection(self) -> bool:
         """Test connection to Ollama server."""
         try:
-            response = self._make_sync_request("GET", "/api/tags")
+            response = self._make_sync_request("GET", self._url_tags)
             return response.status_code == 200
         except Exception:
             return False
     
     async def list_models(self) -> List[str]:
-        """Get list of available models."""
+        """Get list of available models.
+        
+        The list is cached for ``MODELS_CACHE_TTL`` seconds.
+        """
+        cached = self._models_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
+        
         try:
-            response = self._make_sync_request("GET", "/api/tags")
-            data = response.json()
-            
-            models = []
-            self.available_models.clear()
+            data = await self._request_json("GET", self._url_tags)
             
-            for model_data in data.get("models", []):
-                model_name = model_data["name"]
-                models.append(model_name)
-                
-                self.available_models[model_name] = ModelInfo(
-                    name=model_name,
+            self.available_models = {
+                model_data["name"]: ModelInfo(
+                    name=model_data["name"],
                     size=model_data.get("size", 0),
                     modified_at=model_data.get("modified_at", ""),
                     digest=model_data.get("digest", ""),
                     status=ModelStatus.AVAILABLE
                 )
+                for model_data in data.get("models", [])
+            }
+            models = list(self.available_models)
             
-            return models
+            self._models_cache = (time.monotonic() + MODELS_CACHE_TTL, models)
+            return list(models)
             
         except Exception as e:
             print(f"Error listing models: {e}")
@@ -217,25 +423,23 @@ class OllamaClient(IOllamaClient):
             if model_name in self.available_models:
                 self.available_models[model_name].status = ModelStatus.LOADING
             
-            # Make a simple generation request to load the model
+            # Confirm the model exists from its metadata, then preload it.
+            # A generate request with an empty prompt loads the model without
+            # running a forward pass, and keep_alive=-1 keeps it resident.
+            await self._request_json("POST", self._url_show, json={"name": model_name})
             payload = {
                 "model": model_name,
-                "prompt": "Hello",
+                "prompt": "",
                 "stream": False,
+                "keep_alive": -1,
                 "options": {"num_predict": 1}
             }
+            await self._request_json("POST", self._url_generate, json=payload)
             
-            response = self._make_sync_request("POST", "/api/generate", json=payload)
-            
-            if response.status_code == 200:
-                self.current_model = model_name
-                if model_name in self.available_models:
-                    self.available_models[model_name].status = ModelStatus.AVAILABLE
-                return True
-            else:
-                if model_name in self.available_models:
-                    self.available_models[model_name].status = ModelStatus.ERROR
-                return False
+            self.current_model = model_name
+            if model_name in self.available_models:
+                self.available_models[model_name].status = ModelStatus.AVAILABLE
+            return True
                 
         except Exception as e:
             print(f"Error loading model {model_name}: {e}")
@@ -244,10 +448,23 @@ class OllamaClient(IOllamaClient):
             return False
     
     async def generate_response(self, prompt: str, stream: bool = False) -> str:
-        """Generate response from current model."""
+        """Generate response from current model.
+        
+        Non-streamed responses are cached for ``RESPONSE_CACHE_TTL`` seconds
+        when the model options make generation deterministic, and concurrent
+        identical non-streamed requests share one round trip.
+        """
         if not self.current_model:
             raise ValueError("No model loaded")
         
+        key = None if stream else self._request_key(prompt)
+        cacheable = key is not None and self._is_deterministic(self.model_config)
+        if cacheable:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(key)
+                return cached[1]
+        
         payload = {
             "model": self.current_model,
             "prompt": prompt,
@@ -257,39 +474,152 @@ class OllamaClient(IOllamaClient):
         
         try:
             if stream:
-                return await self._generate_streaming_response(payload)
-            else:
-                response = self._make_sync_request("POST", "/api/generate", json=payload)
-                data = response.json()
-                return data.get("response", "")
+                async with self._generation_slots():
+                    return await self._generate_streaming_response(payload)
+            
+            pending = self._inflight.get(key) if key is not None else None
+            if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+                # Shielded so a cancelled waiter doesn't cancel the others
+                return await asyncio.shield(pending)
+            
+            future = self._enqueue_generation(payload)
+            if key is not None:
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            response = await asyncio.shield(future)
+            if cacheable:
+                self._cache_response(key, response)
+            return response
                 
         except Exception as e:
             print(f"Error generating response: {e}")
             raise e
     
+    def _request_key(self, prompt: str) -> Optional[tuple]:
+        """Key identifying a generation, or None if the options are unhashable."""
+        key = (self.current_model, prompt, tuple(sorted(self.model_config.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def clear_cache(self):
+        """Drop cached responses, e.g. after switching servers."""
+        self._cache.clear()
+        self._models_cache = None
+        self._server_info_cache = None
+    
+    @staticmethod
+    def _is_deterministic(options: Dict[str, Any]) -> bool:
+        """Whether generation with ``options`` gives the same text every time."""
+        return options.get('temperature') == 0 or options.get('seed') is not None
+    
+    def _cache_response(self, key: tuple, response: str):
+        """Store a generated response, evicting the least recently used."""
+        self._cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, response)
+        self._cache.move_to_end(key)
+        if len(self._cache) > RESPONSE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def _generation_slots(self) -> asyncio.Semaphore:
+        """The generation semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._gen_sem is None or self._gen_sem_loop is not loop:
+            self._gen_sem = asyncio.Semaphore(self.max_concurrent_generations)
+            self._gen_sem_loop = loop
+        return self._gen_sem
+    
+    def _enqueue_generation(self, payload: Dict[str, Any]) -> asyncio.Future:
+        """Queue a generate request and return a future for its response text."""
+        loop = asyncio.get_running_loop()
+        if (self._batch_task is None or self._batch_task.done()
+                or self._batch_loop is not loop):
+            self._req_queue = asyncio.Queue()
+            self._batch_loop = loop
+            self._batch_task = loop.create_task(self._batch_dispatcher(self._req_queue))
+        
+        future = loop.create_future()
+        self._req_queue.put_nowait((payload, future))
+        return future
+    
+    async def _batch_dispatcher(self, queue: asyncio.Queue):
+        """Collect queued generate requests into batches and dispatch them.
+        
+        A batch closes after ``GENERATE_BATCH_WINDOW`` or once it holds
+        ``GENERATE_BATCH_SIZE`` requests. Each batch runs in its own task so a
+        slow response doesn't hold up the next batch; the semaphore still
+        bounds how many requests reach the server.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + GENERATE_BATCH_WINDOW
+            while len(batch) < GENERATE_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            run = asyncio.gather(
+                *(self._run_generation(payload, future) for payload, future in batch)
+            )
+            self._batch_runs.add(run)
+            run.add_done_callback(self._batch_runs.discard)
+    
+    async def _run_generation(self, payload: Dict[str, Any], future: asyncio.Future):
+        """Issue one queued generate request and resolve its future."""
+        if future.done():
+            return
+        try:
+            async with self._generation_slots():
+                data = await self._request_json("POST", self._url_generate, json=payload)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(data.get("response", ""))
+    
+    @staticmethod
+    async def _iter_stream_text(response: aiohttp.ClientResponse) -> AsyncIterator[str]:
+        """Yield the text chunks of a streamed generate response until done.
+        
+        The body is read in blocks and split into NDJSON lines here, rather
+        than awaiting the stream once per line.
+        """
+        buffer = bytearray()
+        async for block in response.content.iter_chunked(STREAM_READ_SIZE):
+            buffer.extend(block)
+            lines = buffer.split(b"\n")
+            buffer = lines.pop()
+            for line in lines:
+                data = _parse_stream_line(line)
+                if data is None:
+                    continue
+                if 'response' in data:
+                    yield data['response']
+                if data.get('done', False):
+                    return
+        
+        # Last line without a trailing newline
+        data = _parse_stream_line(buffer)
+        if data is not None and 'response' in data:
+            yield data['response']
+    
     async def _generate_streaming_response(self, payload: Dict[str, Any]) -> str:
         """Generate streaming response."""
-        session = await self._get_session()
-        url = f"{self.base_url.rstrip('/')}/api/generate"
-        
-        full_response = ""
+        parts: List[str] = []
         
         try:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                
-                async for line in response.content:
-                    if line:
-                        try:
-                            data = json.loads(line.decode('utf-8'))
-                            if 'response' in data:
-                                full_response += data['response']
-                            if data.get('done', False):
-                                break
-                        except json.JSONDecodeError:
-                            continue
+            async with self._request_stream("POST", self._url_generate, json=payload) as response:
+                async for text in self._iter_stream_text(response):
+                    parts.append(text)
             
-            return full_response
+            return "".join(parts)
             
         except Exception as e:
             print(f"Error in streaming response: {e}")
@@ -307,23 +637,10 @@ class OllamaClient(IOllamaClient):
             "options": self.model_config
         }
         
-        session = await self._get_session()
-        url = f"{self.base_url.rstrip('/')}/api/generate"
-        
         try:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                
-                async for line in response.content:
-                    if line:
-                        try:
-                            data = json.loads(line.decode('utf-8'))
-                            if 'response' in data:
-                                yield data['response']
-                            if data.get('done', False):
-                                break
-                        except json.JSONDecodeError:
-                            continue
+            async with self._generation_slots(), self._request_stream("POST", self._url_generate, json=payload) as response:
+                async for text in self._iter_stream_text(response):
+                    yield text
                             
         except Exception as e:
             print(f"Error in streaming response: {e}")
@@ -331,16 +648,11 @@ class OllamaClient(IOllamaClient):
     
     def configure_model_parameters(self, **kwargs) -> None:
         """Configure model parameters."""
-        valid_params = {
-            'temperature', 'top_p', 'top_k', 'num_predict', 
-            'num_ctx', 'repeat_penalty', 'seed'
-        }
-        
-        for key, value in kwargs.items():
-            if key in valid_params:
-                self.model_config[key] = value
-            else:
-                print(f"Warning: Unknown parameter '{key}' ignored")
+        self.model_config.update(
+            {key: value for key, value in kwargs.items() if key in _VALID_MODEL_PARAMS}
+        )
+        for key in kwargs.keys() - _VALID_MODEL_PARAMS:
+            print(f"Warning: Unknown parameter '{key}' ignored")
     
     def get_model_info(self, model_name: str) -> Optional[ModelInfo]:
         """Get information about a specific model."""
@@ -350,16 +662,18 @@ class OllamaClient(IOllamaClient):
         """Get currently loaded model name."""
         return self.current_model
     
-    def get_model_config(self) -> Dict[str, Any]:
-        """Get current model configuration."""
-        return self.model_config.copy()
+    def get_model_config(self) -> Mapping[str, Any]:
+        """Get a read-only live view of the current model configuration."""
+        return self._model_config_view
     
     async def pull_model(self, model_name: str) -> bool:
         """Pull/download a model from Ollama registry."""
         try:
-            payload = {"name": model_name}
-            response = self._make_sync_request("POST", "/api/pull", json=payload)
-            return response.status_code == 200
+            # Without stream=False the server sends progress as NDJSON
+            payload = {"name": model_name, "stream": False}
+            await self._request_json("POST", self._url_pull, json=payload)
+            self._models_cache = None
+            return True
         except Exception as e:
             print(f"Error pulling model {model_name}: {e}")
             return False
@@ -368,46 +682,36 @@ class OllamaClient(IOllamaClient):
         """Delete a model from local storage."""
         try:
             payload = {"name": model_name}
-            response = self._make_sync_request("DELETE", "/api/delete", json=payload)
+            await self._request_json("DELETE", self._url_delete, json=payload)
+            self._models_cache = None
             
-            if response.status_code == 200:
-                # Remove from available models
-                if model_name in self.available_models:
-                    del self.available_models[model_name]
-                
-                # Clear current model if it was deleted
-                if self.current_model == model_name:
-                    self.current_model = None
-                
-                return True
-            return False
+            # Remove from available models
+            if model_name in self.available_models:
+                del self.available_models[model_name]
+            
+            # Clear current model if it was deleted
+            if self.current_model == model_name:
+                self.current_model = None
+            
+            return True
             
         except Exception as e:
             print(f"Error deleting model {model_name}: {e}")
             return False
     
-    def get_server_info(self) -> Dict[str, Any]:
-        """Get Ollama server information."""
+    async def get_server_info(self) -> Dict[str, Any]:
+        """Get Ollama server information.
+        
+        The result is cached for ``SERVER_INFO_CACHE_TTL`` seconds.
+        """
+        cached = self._server_info_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
         try:
-            response = self._make_sync_request("GET", "/api/version")
-            return response.json()
+            info = await self._request_json("GET", self._url_version)
+            self._server_info_cache = (time.monotonic() + SERVER_INFO_CACHE_TTL, info)
+            return dict(info)
         except Exception as e:
             print(f"Error getting server info: {e}")
             return {}
-    
-    def __del__(self):
-        """Cleanup when client is destroyed."""
-        if self._session and not self._session.closed:
-            # Create a new event loop if none exists
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            
-            if loop.is_running():
-                # Schedule cleanup
-                loop.create_task(self.close())
-            else:
-                # Run cleanup
-                loop.run_until_complete(self.close())
\ No newline at end of file
@@ -4,31 +4,212 @@ Processes user queries and converts them to analysis operations.
 """
 
 import pandas as pd
-import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
 import re
 import json
 import asyncio
+import functools
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
 import logging
+import weakref
 
 from .ollama_client import OllamaClient
+from ..utils.compat import HAS_ORJSON, orjson
+
+
+# Normalized queries and rule-based intent scores kept per processor
+QUERY_CACHE_SIZE = 1024
+
+# LLM intent and parameter answers kept per processor
+LLM_CACHE_SIZE = 256
+
+# Column-name regexes kept per processor, one per distinct column list
+COLUMN_CACHE_SIZE = 32
+
+# Rule-based confidence above which a query with all its required
+# parameters skips the LLM intent and parameter calls
+RULES_FAST_PATH_CONFIDENCE = 0.6
+
+# Query words steering rule-based parameter extraction, with their common
+# inflections so a token-set lookup matches what a substring test would
+FORECAST_WORDS = frozenset({
+    'forecast', 'forecasts', 'forecasting', 'forecasted',
+    'predict', 'predicts', 'predicting', 'predicted', 'prediction', 'predictions'
+})
+GROUPING_WORDS = frozenset({
+    'cluster', 'clusters', 'clustering', 'clustered',
+    'group', 'groups', 'grouping', 'grouped'
+})
+THRESHOLD_WORDS = frozenset({'threshold', 'thresholds'})
+INCREASING_WORDS = frozenset({'increase', 'increases', 'increasing', 'increased', 'growing', 'rising'})
+DECREASING_WORDS = frozenset({'decrease', 'decreases', 'decreasing', 'decreased', 'declining', 'falling'})
+
+# Splits a lower-cased query into word tokens
+QUERY_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Query normalization
+WHITESPACE_PATTERN = re.compile(r'\s+')
+TRAILING_PUNCTUATION_PATTERN = re.compile(r'[.!?]+$')
+
+# Numbers in a query, and the values named in "between X and Y"
+NUMBER_PATTERN = re.compile(r'\b\d+\.?\d*\b')
+BETWEEN_PATTERN = re.compile(r'between\s+(\w+)\s+and\s+(\w+)', re.IGNORECASE)
+
+# Time period keywords, checked in order
+PERIOD_PATTERNS = (
+    ('daily', re.compile(r'daily|day|days', re.IGNORECASE)),
+    ('weekly', re.compile(r'weekly|week|weeks', re.IGNORECASE)),
+    ('monthly', re.compile(r'monthly|month|months', re.IGNORECASE)),
+    ('yearly', re.compile(r'yearly|year|years|annual', re.IGNORECASE))
+)
+
+# Grouping words and the cluster count that may follow them ("segment 4")
+GROUP_NUMBER_PATTERNS = tuple(
+    (word, re.compile(rf'{word}\s*(\d+)', re.IGNORECASE))
+    for word in ('group', 'cluster', 'segment', 'category')
+)
+
+# Queries from one batch processed at the same time
+BATCH_QUERY_CONCURRENCY = 5
+
+# Schema limits for LLM prompts; wide sheets are truncated to keep prefill short
+PROMPT_MAX_COLUMNS = 30
+PROMPT_MAX_NUMERIC_COLUMNS = 10
+PROMPT_MAX_CATEGORICAL_COLUMNS = 10
+PROMPT_MAX_DATETIME_COLUMNS = 5
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON text, with orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_text(value: Any) -> str:
+    """Indented JSON for prompts; values JSON can't encode are stringified."""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(
+                value, default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode()
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2, default=str)
+
+
+class _JsonObjectScanner:
+    """Finds the first complete, valid JSON object in streamed text."""
+    
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """Consume a chunk; return the object once its closing brace arrives."""
+        for char in chunk:
+            if self._depth == 0:
+                if char != '{':
+                    continue
+                self._buffer = []
+            self._buffer.append(char)
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        return _json_loads(''.join(self._buffer))
+                    except ValueError:
+                        continue
+        return None
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation matching any of ``words``, factored as a trie.
+    
+    Words sharing a prefix share one branch (``trend(?:ing)?``), so the
+    engine walks each prefix once and prefers the longest word.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, dict]) -> str:
+    """Pattern for the suffixes below one trie node."""
+    branches = [re.escape(char) + _trie_node_pattern(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if '' in node:
+        return '(?:' + '|'.join(branches) + ')?'
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
 
 
 class QueryProcessor:
     """Processes natural language queries and converts them to analysis operations."""
     
-    def __init__(self, ollama_client: OllamaClient):
+    def __init__(self, ollama_client: OllamaClient, stream_json: bool = False):
         self.ollama_client = ollama_client
         self.logger = logging.getLogger(__name__)
         
-        # Query patterns and mappings
+        # Streamed JSON replies bypass the client's request batching,
+        # deterministic cache and coalescing, so they are opt-in.
+        self.stream_json = stream_json
+        
+        # Query patterns and mappings. All keywords are fused into one regex
+        # so a query is scanned once; each matched keyword maps back to the
+        # intents listing it (forecast/predict/future count for two).
+        # query_patterns is kept for debugging.
         self.query_patterns = self._initialize_query_patterns()
+        self.keyword_intents: Dict[str, Tuple[str, ...]] = {}
+        for intent_type, patterns in self.query_patterns.items():
+            for pattern in patterns:
+                keyword = pattern.pattern.lower()
+                self.keyword_intents[keyword] = self.keyword_intents.get(keyword, ()) + (intent_type,)
+        self.intent_regex = re.compile(
+            rf'\b{_trie_pattern(list(self.keyword_intents))}', re.IGNORECASE
+        )
         self.analysis_mappings = self._initialize_analysis_mappings()
         
-    def _initialize_query_patterns(self) -> Dict[str, List[str]]:
+        # Repeated queries skip normalization, rule scoring and the LLM.
+        # LLM answers are keyed on the query and the frame's schema.
+        self._normalize_query_cached = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._normalize_query)
+        self._score_intents_cached = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._score_intents)
+        self._column_regex_cached = functools.lru_cache(maxsize=COLUMN_CACHE_SIZE)(self._column_regex)
+        self._column_names_cached = functools.lru_cache(maxsize=COLUMN_CACHE_SIZE)(self._column_names)
+        self._llm_intent_cache: OrderedDict = OrderedDict()
+        
+        # Dtype column lists per live DataFrame:
+        # key -> (weakref to frame, value)
+        self._dtype_cache: Dict[tuple, tuple] = {}
+        self._llm_params_cache: OrderedDict = OrderedDict()
+        
+    def _initialize_query_patterns(self) -> Dict[str, List[re.Pattern]]:
         """Initialize common query patterns for intent recognition."""
-        return {
+        patterns = {
             'trend_analysis': [
                 r'trend', r'trending', r'increase', r'decrease', r'growing', r'declining',
                 r'over time', r'time series', r'forecast', r'predict', r'future'
@@ -58,6 +239,11 @@ class QueryProcessor:
                 r'estimate', r'expect'
             ]
         }
+        
+        return {
+            intent_type: [re.compile(pattern, re.IGNORECASE) for pattern in intent_patterns]
+            for intent_type, intent_patterns in patterns.items()
+        }
     
     def _initialize_analysis_mappings(self) -> Dict[str, Dict[str, Any]]:
         """Initialize mappings from query types to analysis operations."""
@@ -106,13 +292,25 @@ class QueryProcessor:
         """Process natural language query and return analysis specification."""
         try:
             # Clean and normalize query
-            normalized_query = self._normalize_query(query)
-            
-            # Detect query intent
-            intent = await self._detect_intent(normalized_query, data)
-            
-            # Extract parameters from query
-            parameters = await self._extract_parameters(normalized_query, data, intent)
+            normalized_query = self._normalize_query_cached(query)
+            
+            # Rule-based intent and parameters; the LLM calls only depend on
+            # the rule-based intent, so both run concurrently. Clear-cut
+            # queries skip the LLM altogether.
+            intent = self._detect_rule_intent(normalized_query)
+            parameters = self._extract_rule_parameters(normalized_query, data, intent)
+            if self._rules_suffice(intent, parameters):
+                intent['llm_intent'] = {
+                    'primary_intent': intent['primary_intent'],
+                    'confidence': intent['confidence'],
+                    'source': 'rules'
+                }
+            else:
+                intent['llm_intent'], llm_params = await asyncio.gather(
+                    self._llm_intent_detection(normalized_query, data),
+                    self._llm_parameter_extraction(normalized_query, data, intent['primary_intent'])
+                )
+                parameters.update(llm_params)
             
             # Generate clarifying questions if needed
             clarifications = await self._generate_clarifications(intent, parameters, data)
@@ -143,47 +341,98 @@ class QueryProcessor:
                 'processing_timestamp': datetime.now().isoformat()
             }
     
+    async def process_queries(self, queries: List[str], data: pd.DataFrame,
+                              context: Dict[str, Any] = None,
+                              max_concurrency: int = BATCH_QUERY_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Process several queries against the same data concurrently.
+        
+        Results come back in the order of ``queries``. At most
+        ``max_concurrency`` queries are in flight, so a large batch doesn't
+        flood the LLM. A query repeated in the batch, as in a column of
+        free text, is processed once and its result copied.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def process_one(query: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_query(query, data, context)
+        
+        unique_queries = list(dict.fromkeys(queries))
+        results = await asyncio.gather(*(process_one(query) for query in unique_queries))
+        by_query = dict(zip(unique_queries, results))
+        return [dict(by_query[query]) for query in queries]
+    
     async def _detect_intent(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
         """Detect the intent of the user query."""
-        # Rule-based intent detection
-        intent_scores = {}
-        
-        for intent_type, patterns in self.query_patterns.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, query, re.IGNORECASE))
-                score += matches
-            
-            if score > 0:
-                intent_scores[intent_type] = score
+        intent = self._detect_rule_intent(query)
         
         # LLM-based intent detection for complex queries
-        llm_intent = await self._llm_intent_detection(query, data)
+        intent['llm_intent'] = await self._llm_intent_detection(query, data)
+        return intent
+    
+    def _detect_rule_intent(self, query: str) -> Dict[str, Any]:
+        """Rule-based part of intent detection, without the LLM opinion."""
+        intent_scores = dict(self._score_intents_cached(query))
+        
+        if not intent_scores:
+            return {'primary_intent': 'general_analysis', 'intent_scores': intent_scores, 'confidence': 0.3}
         
         # Combine rule-based and LLM results
-        primary_intent = max(intent_scores.items(), key=lambda x: x[1])[0] if intent_scores else 'general_analysis'
+        primary_intent = max(intent_scores, key=intent_scores.get)
         
         return {
             'primary_intent': primary_intent,
             'intent_scores': intent_scores,
-            'llm_intent': llm_intent,
-            'confidence': max(intent_scores.values()) / len(query.split()) if intent_scores else 0.3
+            'confidence': intent_scores[primary_intent] / len(query.split())
         }
     
+    def _rules_suffice(self, intent: Dict[str, Any], parameters: Dict[str, Any]) -> bool:
+        """Whether the rule-based result is confident and complete enough to skip the LLM."""
+        mapping = self.analysis_mappings.get(intent['primary_intent'])
+        if mapping is None or intent['confidence'] <= RULES_FAST_PATH_CONFIDENCE:
+            return False
+        # A tie between intents is left for the LLM to settle
+        scores = sorted(intent['intent_scores'].values(), reverse=True)
+        if len(scores) > 1 and scores[0] == scores[1]:
+            return False
+        # 'data' is the frame itself, always supplied by the caller
+        return all(param == 'data' or param in parameters for param in mapping['requires'])
+    
+    def _score_intents(self, query: str) -> Dict[str, int]:
+        """Count keyword matches per intent in a single pass over the query."""
+        intent_scores = {}
+        for match in self.intent_regex.finditer(query):
+            for intent_type in self.keyword_intents[match.group().lower()]:
+                intent_scores[intent_type] = intent_scores.get(intent_type, 0) + 1
+        return intent_scores
+    
+    @staticmethod
+    def _data_fingerprint(data: pd.DataFrame) -> str:
+        """Digest of a frame's shape, columns and dtypes; rows are not hashed."""
+        schema = f"{data.shape}|{','.join(map(str, data.columns))}|{data.dtypes.values}"
+        return hashlib.blake2b(schema.encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key: tuple, value: Dict[str, Any]):
+        """Store an LLM answer, evicting the least recently used."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > LLM_CACHE_SIZE:
+            cache.popitem(last=False)
+    
     async def _llm_intent_detection(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
         """Use LLM to detect query intent for complex cases."""
+        key = (query, self._data_fingerprint(data))
+        cached = self._llm_intent_cache.get(key)
+        if cached is not None:
+            self._llm_intent_cache.move_to_end(key)
+            return dict(cached)
+        
         try:
-            data_info = self._get_data_summary(data)
-            
+            # Static instructions first and the query-specific part last, so
+            # the server's prompt cache can reuse the shared prefix
             prompt = f"""
-            Analyze this user query about data analysis and determine the intent:
-            
-            Query: "{query}"
-            
-            Data Information:
-            - Shape: {data.shape}
-            - Columns: {list(data.columns)}
-            - Data types: {data.dtypes.to_dict()}
+            Analyze a user query about data analysis and determine the intent.
             
             Available analysis types:
             - trend_analysis: Analyze trends over time
@@ -201,20 +450,25 @@ class QueryProcessor:
             4. Reasoning
             
             Format as JSON.
+            
+            Data Information:
+            {_json_text(self._schema_summary(data))}
+            
+            Query: "{query}"
             """
             
-            response = await self.ollama_client.generate_response(prompt)
+            llm_intent, response = await self._generate_json(prompt)
             
-            # Try to parse JSON response
-            try:
-                return json.loads(response)
-            except:
+            if not isinstance(llm_intent, dict):
                 # Fallback to text parsing
-                return {
+                llm_intent = {
                     'primary_intent': 'general_analysis',
                     'confidence': 0.5,
                     'reasoning': response
                 }
+            
+            self._cache_put(self._llm_intent_cache, key, llm_intent)
+            return dict(llm_intent)
                 
         except Exception as e:
             self.logger.error(f"Error in LLM intent detection: {e}")
@@ -227,12 +481,27 @@ class QueryProcessor:
     async def _extract_parameters(self, query: str, data: pd.DataFrame, 
                                 intent: Dict[str, Any]) -> Dict[str, Any]:
         """Extract parameters from the query based on detected intent."""
+        parameters = self._extract_rule_parameters(query, data, intent)
+        
+        # Use LLM for complex parameter extraction
+        llm_params = await self._llm_parameter_extraction(query, data, intent['primary_intent'])
+        parameters.update(llm_params)
+        
+        return parameters
+    
+    def _extract_rule_parameters(self, query: str, data: pd.DataFrame,
+                                 intent: Dict[str, Any]) -> Dict[str, Any]:
+        """Rule-based part of parameter extraction, without the LLM."""
         parameters = {}
         
         primary_intent = intent['primary_intent']
         
+        # Lower-case and tokenize once for all the keyword tests below
+        query_lower = query.lower()
+        tokens = frozenset(QUERY_TOKEN_PATTERN.findall(query_lower))
+        
         # Extract column references
-        columns = self._extract_column_references(query, data)
+        columns = self._extract_column_references(query_lower, data)
         if columns:
             parameters['columns'] = columns
         
@@ -241,125 +510,133 @@ class QueryProcessor:
         parameters.update(time_params)
         
         # Extract numeric parameters
-        numeric_params = self._extract_numeric_parameters(query)
+        numeric_params = self._extract_numeric_parameters(query, tokens)
         parameters.update(numeric_params)
         
         # Intent-specific parameter extraction
         if primary_intent == 'trend_analysis':
-            parameters.update(self._extract_trend_parameters(query, data))
+            parameters.update(self._extract_trend_parameters(tokens, data))
         elif primary_intent == 'forecasting':
-            parameters.update(self._extract_forecast_parameters(query))
+            parameters.update(self._extract_forecast_parameters(query_lower))
         elif primary_intent == 'clustering':
-            parameters.update(self._extract_clustering_parameters(query))
+            parameters.update(self._extract_clustering_parameters(query, query_lower))
         elif primary_intent == 'comparison':
-            parameters.update(self._extract_comparison_parameters(query, data))
-        
-        # Use LLM for complex parameter extraction
-        llm_params = await self._llm_parameter_extraction(query, data, primary_intent)
-        parameters.update(llm_params)
+            parameters.update(self._extract_comparison_parameters(query, tokens, data))
         
         return parameters
     
-    def _extract_column_references(self, query: str, data: pd.DataFrame) -> List[str]:
-        """Extract column references from the query."""
+    def _extract_column_references(self, query_lower: str, data: pd.DataFrame) -> List[str]:
+        """Extract column references from the lower-cased query."""
         referenced_columns = []
-        
-        # Look for exact column name matches
-        for column in data.columns:
-            if column.lower() in query.lower():
+        columns = tuple(data.columns)
+        column_names = self._column_names_cached(columns)
+        
+        # Look for exact column name matches: one scan finds the longest
+        # column name starting at each position, and any shorter name found
+        # there is a prefix of it
+        if len(data.columns):
+            found = set()
+            for match in self._column_regex_cached(columns).finditer(query_lower):
+                name = match.group(1)
+                found.update(name[:end] for end in range(1, len(name) + 1))
+            referenced_columns = [column for column, name, _ in column_names if name in found]
+        
+        # Look for partial matches: columns sharing an underscore-separated
+        # word with the query
+        query_words = set(query_lower.split())
+        already = set(referenced_columns)
+        for column, _, column_words in column_names:
+            if column not in already and not column_words.isdisjoint(query_words):
                 referenced_columns.append(column)
-        
-        # Look for partial matches
-        query_words = query.lower().split()
-        for column in data.columns:
-            column_words = column.lower().split('_')
-            if any(word in query_words for word in column_words):
-                if column not in referenced_columns:
-                    referenced_columns.append(column)
+                already.add(column)
         
         return referenced_columns
     
+    @staticmethod
+    def _column_regex(columns: Tuple) -> re.Pattern:
+        """Regex finding, at every position, the longest lower-cased column name."""
+        return re.compile(f"(?=({_trie_pattern([str(column).lower() for column in columns])}))")
+    
+    @staticmethod
+    def _column_names(columns: Tuple) -> Tuple[Tuple[Any, str, frozenset], ...]:
+        """Each column with its lower-cased name and that name's underscore-separated words."""
+        names = [(column, str(column).lower()) for column in columns]
+        return tuple((column, name, frozenset(name.split('_'))) for column, name in names)
+    
     def _extract_time_parameters(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
         """Extract time-related parameters from the query."""
         params = {}
         
         # Find datetime columns
-        datetime_columns = data.select_dtypes(include=['datetime64']).columns.tolist()
+        datetime_columns = self._dtype_index(data)['datetime']
         if datetime_columns:
             params['time_column'] = datetime_columns[0]
         
         # Extract time periods
-        period_patterns = {
-            'daily': r'daily|day|days',
-            'weekly': r'weekly|week|weeks',
-            'monthly': r'monthly|month|months',
-            'yearly': r'yearly|year|years|annual'
-        }
-        
-        for period, pattern in period_patterns.items():
-            if re.search(pattern, query, re.IGNORECASE):
+        for period, pattern in PERIOD_PATTERNS:
+            if pattern.search(query):
                 params['frequency'] = period
                 break
         
         return params
     
-    def _extract_numeric_parameters(self, query: str) -> Dict[str, Any]:
-        """Extract numeric parameters from the query."""
+    def _extract_numeric_parameters(self, query: str, tokens: frozenset) -> Dict[str, Any]:
+        """Extract numeric parameters from the query and its lower-cased word tokens."""
         params = {}
         
-        # Extract numbers
-        numbers = re.findall(r'\b\d+\.?\d*\b', query)
+        # Only the first number is used, so stop the scan there
+        match = NUMBER_PATTERN.search(query)
+        if match is None:
+            return params
+        number = float(match.group())
         
         # Context-based number interpretation
-        if 'forecast' in query.lower() or 'predict' in query.lower():
-            if numbers:
-                params['periods'] = int(float(numbers[0]))
+        if not tokens.isdisjoint(FORECAST_WORDS):
+            params['periods'] = int(number)
         
-        if 'cluster' in query.lower() or 'group' in query.lower():
-            if numbers:
-                params['n_clusters'] = int(float(numbers[0]))
+        if not tokens.isdisjoint(GROUPING_WORDS):
+            params['n_clusters'] = int(number)
         
-        if 'threshold' in query.lower():
-            if numbers:
-                params['threshold'] = float(numbers[0])
+        if not tokens.isdisjoint(THRESHOLD_WORDS):
+            params['threshold'] = number
         
         return params
     
-    def _extract_trend_parameters(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
-        """Extract trend analysis specific parameters."""
+    def _extract_trend_parameters(self, tokens: frozenset, data: pd.DataFrame) -> Dict[str, Any]:
+        """Extract trend analysis specific parameters from the query's word tokens."""
         params = {}
         
         # Identify value columns for trend analysis
-        numeric_columns = data.select_dtypes(include=[np.number]).columns.tolist()
+        numeric_columns = self._dtype_index(data)['numeric']
         if numeric_columns:
             params['value_columns'] = numeric_columns
         
         # Extract trend direction interest
-        if any(word in query.lower() for word in ['increase', 'growing', 'rising']):
+        if not tokens.isdisjoint(INCREASING_WORDS):
             params['trend_direction'] = 'increasing'
-        elif any(word in query.lower() for word in ['decrease', 'declining', 'falling']):
+        elif not tokens.isdisjoint(DECREASING_WORDS):
             params['trend_direction'] = 'decreasing'
         
         return params
     
-    def _extract_forecast_parameters(self, query: str) -> Dict[str, Any]:
-        """Extract forecasting specific parameters."""
+    def _extract_forecast_parameters(self, query_lower: str) -> Dict[str, Any]:
+        """Extract forecasting specific parameters from the lower-cased query."""
         params = {}
         
         # Default forecast periods
         params['periods'] = 10
         
         # Look for specific time horizons
-        if 'next month' in query.lower():
+        if 'next month' in query_lower:
             params['periods'] = 30
-        elif 'next week' in query.lower():
+        elif 'next week' in query_lower:
             params['periods'] = 7
-        elif 'next year' in query.lower():
+        elif 'next year' in query_lower:
             params['periods'] = 365
         
         return params
     
-    def _extract_clustering_parameters(self, query: str) -> Dict[str, Any]:
+    def _extract_clustering_parameters(self, query: str, query_lower: str) -> Dict[str, Any]:
         """Extract clustering specific parameters."""
         params = {}
         
@@ -367,30 +644,29 @@ class QueryProcessor:
         params['n_clusters'] = 3
         
         # Look for grouping hints
-        group_words = ['group', 'cluster', 'segment', 'category']
-        for word in group_words:
-            if word in query.lower():
+        for word, pattern in GROUP_NUMBER_PATTERNS:
+            if word in query_lower:
                 # Look for numbers near grouping words
-                pattern = rf'{word}\s*(\d+)'
-                match = re.search(pattern, query, re.IGNORECASE)
+                match = pattern.search(query)
                 if match:
                     params['n_clusters'] = int(match.group(1))
         
         return params
     
-    def _extract_comparison_parameters(self, query: str, data: pd.DataFrame) -> Dict[str, Any]:
+    def _extract_comparison_parameters(self, query: str, tokens: frozenset,
+                                       data: pd.DataFrame) -> Dict[str, Any]:
         """Extract comparison specific parameters."""
         params = {}
         
         # Look for comparison keywords
-        if 'between' in query.lower():
+        if 'between' in tokens:
             # Try to extract what's being compared
-            between_match = re.search(r'between\s+(\w+)\s+and\s+(\w+)', query, re.IGNORECASE)
+            between_match = BETWEEN_PATTERN.search(query)
             if between_match:
                 params['compare_values'] = [between_match.group(1), between_match.group(2)]
         
         # Look for categorical columns for grouping
-        categorical_columns = data.select_dtypes(include=['object']).columns.tolist()
+        categorical_columns = self._dtype_index(data)['object']
         if categorical_columns:
             params['group_by'] = categorical_columns[0]
         
@@ -399,17 +675,16 @@ class QueryProcessor:
     async def _llm_parameter_extraction(self, query: str, data: pd.DataFrame, 
                                       intent: str) -> Dict[str, Any]:
         """Use LLM to extract complex parameters."""
+        key = (query, intent, self._data_fingerprint(data))
+        cached = self._llm_params_cache.get(key)
+        if cached is not None:
+            self._llm_params_cache.move_to_end(key)
+            return dict(cached)
+        
         try:
-            data_info = self._get_data_summary(data)
-            
+            # Static instructions first, as in _llm_intent_detection
             prompt = f"""
-            Extract analysis parameters from this query:
-            
-            Query: "{query}"
-            Intent: {intent}
-            
-            Data Information:
-            {json.dumps(data_info, indent=2)}
+            Extract analysis parameters from a data analysis query.
             
             Extract relevant parameters such as:
             - Specific columns to analyze
@@ -419,19 +694,61 @@ class QueryProcessor:
             - Analysis methods or approaches
             
             Return as JSON with parameter names and values.
+            
+            Data Information:
+            {_json_text(self._schema_summary(data))}
+            
+            Intent: {intent}
+            Query: "{query}"
             """
             
-            response = await self.ollama_client.generate_response(prompt)
+            llm_params, _ = await self._generate_json(prompt)
+            if not isinstance(llm_params, dict):
+                llm_params = {}
             
-            try:
-                return json.loads(response)
-            except:
-                return {}
+            self._cache_put(self._llm_params_cache, key, llm_params)
+            return dict(llm_params)
                 
         except Exception as e:
             self.logger.error(f"Error in LLM parameter extraction: {e}")
             return {}
     
+    async def _generate_json(self, prompt: str) -> Tuple[Optional[Any], str]:
+        """Ask the LLM for JSON; return the parsed value (or None) and the text.
+        
+        By default the prompt goes through generate_response. With stream_json
+        set and a streaming client, the reply is parsed as it arrives and the
+        stream is closed as soon as the first complete JSON object is in,
+        instead of waiting for any text the model adds after it.
+        """
+        stream = None
+        if self.stream_json:
+            stream = getattr(self.ollama_client, 'generate_streaming_response', None)
+        if stream is None:
+            response = await self.ollama_client.generate_response(prompt)
+            try:
+                return _json_loads(response), response
+            except ValueError:
+                return None, response
+        
+        scanner = _JsonObjectScanner()
+        parts = []
+        chunks = stream(prompt)
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                parsed = scanner.feed(chunk)
+                if parsed is not None:
+                    return parsed, ''.join(parts)
+        finally:
+            await chunks.aclose()
+        
+        response = ''.join(parts)
+        try:
+            return _json_loads(response), response
+        except ValueError:
+            return None, response
+    
     async def _generate_clarifications(self, intent: Dict[str, Any], 
                                      parameters: Dict[str, Any], 
                                      data: pd.DataFrame) -> List[str]:
@@ -456,13 +773,13 @@ class QueryProcessor:
             for param in required_params:
                 if param not in parameters:
                     if param == 'time_column':
-                        datetime_cols = data.select_dtypes(include=['datetime64']).columns.tolist()
+                        datetime_cols = self._dtype_index(data)['datetime']
                         if len(datetime_cols) > 1:
                             clarifications.append(
                                 f"Which time column should I use for analysis? Options: {', '.join(datetime_cols)}"
                             )
                     elif param == 'value_columns':
-                        numeric_cols = data.select_dtypes(include=[np.number]).columns.tolist()
+                        numeric_cols = self._dtype_index(data)['numeric']
                         if len(numeric_cols) > 3:
                             clarifications.append(
                                 f"Which numeric columns should I analyze? You have: {', '.join(numeric_cols)}"
@@ -506,7 +823,7 @@ class QueryProcessor:
             spec['parameters'] = {
                 'time_column': parameters.get('time_column'),
                 'value_columns': parameters.get('value_columns', 
-                    data.select_dtypes(include=[np.number]).columns.tolist())
+                    self._dtype_index(data)['numeric'])
             }
         elif primary_intent == 'forecasting':
             spec['parameters'] = {
@@ -515,7 +832,7 @@ class QueryProcessor:
         elif primary_intent == 'clustering':
             spec['parameters'] = {
                 'features': parameters.get('columns', 
-                    data.select_dtypes(include=[np.number]).columns.tolist()),
+                    self._dtype_index(data)['numeric']),
                 'n_clusters': parameters.get('n_clusters')
             }
         elif primary_intent == 'pattern_detection':
@@ -537,7 +854,7 @@ class QueryProcessor:
             Analysis Plan:
             - Agent: {analysis_spec['agent']}
             - Method: {analysis_spec['method']}
-            - Parameters: {json.dumps(analysis_spec['parameters'], indent=2)}
+            - Parameters: {_json_text(analysis_spec['parameters'])}
             
             Write a brief, user-friendly explanation of what analysis will be performed.
             """
@@ -554,25 +871,51 @@ class QueryProcessor:
         normalized = query.lower().strip()
         
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized)
+        normalized = WHITESPACE_PATTERN.sub(' ', normalized)
         
         # Remove punctuation at the end
-        normalized = re.sub(r'[.!?]+$', '', normalized)
+        normalized = TRAILING_PUNCTUATION_PATTERN.sub('', normalized)
         
         return normalized
     
-    def _get_data_summary(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Get summary information about the data."""
+    def _dtype_index(self, data: pd.DataFrame) -> Dict[str, List]:
+        """Numeric, object and datetime column names, from one pass over dtypes.
+        
+        Cached per live DataFrame and dtype layout. Callers get fresh lists.
+        """
+        key = (id(data), tuple(data.columns), tuple(map(str, data.dtypes)))
+        entry = self._dtype_cache.get(key)
+        if entry is None or entry[0]() is not data:
+            index = {'numeric': [], 'object': [], 'datetime': []}
+            for column, dtype in data.dtypes.items():
+                if pd.api.types.is_datetime64_any_dtype(dtype):
+                    index['datetime'].append(column)
+                elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                    # pandas 3 stores text as the str dtype rather than object
+                    index['object'].append(column)
+                elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                    index['numeric'].append(column)
+            
+            cache = self._dtype_cache
+            entry = (weakref.ref(data, lambda _: cache.pop(key, None)), index)
+            cache[key] = entry
+        return {kind: list(columns) for kind, columns in entry[1].items()}
+    
+    def _schema_summary(self, data: pd.DataFrame,
+                        max_cols: int = PROMPT_MAX_COLUMNS) -> Dict[str, Any]:
+        """Compact description of the data for LLM prompts.
+        
+        Lists at most ``max_cols`` columns and a few of each kind, so wide
+        sheets don't blow up the prompt.
+        """
+        dtype_index = self._dtype_index(data)
         return {
             'shape': data.shape,
-            'columns': list(data.columns),
-            'dtypes': data.dtypes.to_dict(),
-            'numeric_columns': data.select_dtypes(include=[np.number]).columns.tolist(),
-            'categorical_columns': data.select_dtypes(include=['object']).columns.tolist(),
-            'datetime_columns': data.select_dtypes(include=['datetime64']).columns.tolist(),
-            'missing_values': data.isnull().sum().to_dict(),
-            'sample_values': {col: data[col].dropna().head(3).tolist() 
-                            for col in data.columns if not data[col].empty}
+            'columns': list(data.columns[:max_cols]),
+            'numeric_cols': dtype_index['numeric'][:PROMPT_MAX_NUMERIC_COLUMNS],
+            'categorical_cols': dtype_index['object'][:PROMPT_MAX_CATEGORICAL_COLUMNS],
+            'datetime_cols': dtype_index['datetime'][:PROMPT_MAX_DATETIME_COLUMNS],
+            'truncated': len(data.columns) > max_cols
         }
     
     def _calculate_query_confidence(self, intent: Dict[str, Any], 
@@ -608,7 +951,7 @@ class QueryResponseFormatter:
             Original Query: "{query}"
             
             Analysis Results:
-            {json.dumps(analysis_result, indent=2, default=str)}
+            {_json_text(analysis_result)}
             
             Guidelines:
             1. Start with a direct answer to the user's question
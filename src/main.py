@@ -7,7 +7,12 @@ import sys
 import os
 import asyncio
 import logging
+import threading
+import queue
+from concurrent.futures import Future, wait
 from typing import Dict, Any, Optional
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import xlwings as xw
 
 # Add src directory to path
@@ -18,6 +23,7 @@ from core.agent_controller import AgentController
 from core.excel_interface import ExcelInterface
 from core.query_processor import QueryProcessor, QueryResponseFormatter
 from core.data_processor import DataProcessor
+from core.interfaces import DataInfo
 from agents.analysis_agent import AnalysisAgent
 from agents.pattern_agent import PatternAgent
 from agents.reporting_agent import ReportingAgent
@@ -25,6 +31,21 @@ from ui.dialog_forms import ConfigurationDialog, QueryDialog, ProgressDialog, Re
 from utils.config import PluginConfig
 from utils.logger import setup_logging
 
+# Seconds cleanup waits for the client to close and the loop thread to exit
+SHUTDOWN_TIMEOUT = 5
+
+# Seconds between progress dialog refreshes while a ribbon action waits on
+# the event loop
+UI_POLL_INTERVAL = 0.05
+
+
+def _has_datetime_column(data: pd.DataFrame) -> bool:
+    """Whether any column is datetime64, timezone-aware or not.
+    
+    Checks dtypes only and stops at the first match.
+    """
+    return any(is_datetime64_any_dtype(dtype) for dtype in data.dtypes)
+
 
 class ExcelOllamaPlugin:
     """Main plugin class that coordinates all components."""
@@ -44,6 +65,14 @@ class ExcelOllamaPlugin:
         # UI components
         self.progress_dialog = None
         
+        # Event loop running the async work off Excel's UI thread
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        
+        # (progress, status) updates posted from the loop thread and applied
+        # to the progress dialog on the UI thread
+        self._progress_updates: queue.SimpleQueue = queue.SimpleQueue()
+        
         # Initialize plugin
         self._initialize_plugin()
     
@@ -52,6 +81,14 @@ class ExcelOllamaPlugin:
         try:
             self.logger.info("Initializing Excel-Ollama AI Plugin...")
             
+            # Ribbon callbacks run on Excel's thread, which has no running
+            # event loop; async work is handed to one on a daemon thread
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="ExcelOllamaPluginLoop", daemon=True
+            )
+            self._loop_thread.start()
+            
             # Initialize core components
             self.ollama_client = OllamaClient(self.config.ollama.server_url)
             self.data_processor = DataProcessor()
@@ -59,6 +96,9 @@ class ExcelOllamaPlugin:
             self.query_processor = QueryProcessor(self.ollama_client)
             self.query_formatter = QueryResponseFormatter(self.ollama_client)
             
+            # One progress dialog, reset and shown again for each operation
+            self.progress_dialog = ProgressDialog()
+            
             # Initialize agents
             analysis_agent = AnalysisAgent(self.ollama_client)
             pattern_agent = PatternAgent(self.ollama_client)
@@ -98,11 +138,11 @@ class ExcelOllamaPlugin:
                 return
             
             # Show progress
-            self.progress_dialog = ProgressDialog("Analyzing Data", "Performing statistical analysis...")
+            self.progress_dialog.reset("Analyzing Data", "Performing statistical analysis...")
             self.progress_dialog.show()
             
             # Run analysis in background
-            asyncio.create_task(self._run_analysis(data, 'statistical_analysis'))
+            self._run_analysis(data, 'statistical_analysis')
             
         except Exception as e:
             self.logger.error(f"Error in OnAnalyzeData: {e}")
@@ -119,15 +159,14 @@ class ExcelOllamaPlugin:
                 return
             
             # Check for time series data
-            datetime_cols = data.select_dtypes(include=['datetime64']).columns
-            if len(datetime_cols) == 0:
+            if not _has_datetime_column(data):
                 self._show_error("Trend analysis requires a datetime column. Please ensure your data includes dates/times.")
                 return
             
-            self.progress_dialog = ProgressDialog("Trend Analysis", "Analyzing trends and patterns...")
+            self.progress_dialog.reset("Trend Analysis", "Analyzing trends and patterns...")
             self.progress_dialog.show()
             
-            asyncio.create_task(self._run_analysis(data, 'trend_analysis'))
+            self._run_analysis(data, 'trend_analysis')
             
         except Exception as e:
             self.logger.error(f"Error in OnTrendAnalysis: {e}")
@@ -143,10 +182,10 @@ class ExcelOllamaPlugin:
                 self._show_error("Please select a data range for pattern detection.")
                 return
             
-            self.progress_dialog = ProgressDialog("Pattern Detection", "Detecting patterns and anomalies...")
+            self.progress_dialog.reset("Pattern Detection", "Detecting patterns and anomalies...")
             self.progress_dialog.show()
             
-            asyncio.create_task(self._run_analysis(data, 'pattern_detection'))
+            self._run_analysis(data, 'pattern_detection')
             
         except Exception as e:
             self.logger.error(f"Error in OnPatternDetection: {e}")
@@ -162,21 +201,15 @@ class ExcelOllamaPlugin:
                 self._show_error("Please select a data range to query.")
                 return
             
-            # Show query dialog
-            data_info = {
-                'rows': len(data),
-                'columns': len(data.columns),
-                'column_names': list(data.columns)
-            }
-            
-            query_dialog = QueryDialog(data_info)
+            # Show query dialog; the data info is only computed as it is displayed
+            query_dialog = QueryDialog(DataInfo(data))
             query = query_dialog.show()
             
             if query:
-                self.progress_dialog = ProgressDialog("Processing Query", "Understanding your question...")
+                self.progress_dialog.reset("Processing Query", "Understanding your question...")
                 self.progress_dialog.show()
                 
-                asyncio.create_task(self._process_query(query, data))
+                self._process_query(query, data)
             
         except Exception as e:
             self.logger.error(f"Error in OnQueryData: {e}")
@@ -195,10 +228,10 @@ class ExcelOllamaPlugin:
                 self._show_error("Please select a data range first.")
                 return
             
-            self.progress_dialog = ProgressDialog("Processing Query", "Analyzing your question...")
+            self.progress_dialog.reset("Processing Query", "Analyzing your question...")
             self.progress_dialog.show()
             
-            asyncio.create_task(self._process_query(text, data))
+            self._process_query(text, data)
             
         except Exception as e:
             self.logger.error(f"Error in OnQuickQuery: {e}")
@@ -214,10 +247,10 @@ class ExcelOllamaPlugin:
                 self._show_error("Please select a data range for report generation.")
                 return
             
-            self.progress_dialog = ProgressDialog("Generating Report", "Creating comprehensive analysis report...")
+            self.progress_dialog.reset("Generating Report", "Creating comprehensive analysis report...")
             self.progress_dialog.show()
             
-            asyncio.create_task(self._generate_report(data))
+            self._generate_report(data)
             
         except Exception as e:
             self.logger.error(f"Error in OnGenerateReport: {e}")
@@ -233,10 +266,10 @@ class ExcelOllamaPlugin:
                 self._show_error("Please select a data range for dashboard creation.")
                 return
             
-            self.progress_dialog = ProgressDialog("Creating Dashboard", "Building executive dashboard...")
+            self.progress_dialog.reset("Creating Dashboard", "Building executive dashboard...")
             self.progress_dialog.show()
             
-            asyncio.create_task(self._create_dashboard(data))
+            self._create_dashboard(data)
             
         except Exception as e:
             self.logger.error(f"Error in OnCreateDashboard: {e}")
@@ -278,7 +311,7 @@ class ExcelOllamaPlugin:
             
             # Update Ollama client
             if self.ollama_client:
-                asyncio.create_task(self.ollama_client.load_model(selectedId))
+                self._submit(self.ollama_client.load_model(selectedId))
             
             self.excel_interface.update_ribbon_status(f"Model: {selectedId}")
             
@@ -325,14 +358,71 @@ class ExcelOllamaPlugin:
             self.logger.info("Refresh Connection button clicked")
             
             # Test connection
-            asyncio.create_task(self._test_connection())
+            self.progress_dialog.reset("Testing Connection", "Contacting the Ollama server...")
+            self.progress_dialog.show()
+            
+            self._test_connection()
             
         except Exception as e:
             self.logger.error(f"Error in OnRefreshConnection: {e}")
             self._show_error(f"Connection refresh failed: {e}")
     
-    # Async analysis methods
-    async def _run_analysis(self, data, analysis_type):
+    def _submit(self, coro) -> Future:
+        """Run a coroutine on the plugin's event loop thread.
+        
+        Returns at once with a concurrent future; errors that escape the
+        coroutine are logged rather than lost.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(self._log_task_error)
+        return future
+    
+    def _log_task_error(self, future: Future):
+        """Log the exception of a finished background task, if any."""
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Background task failed: {future.exception()}")
+    
+    def _run_on_loop(self, coro):
+        """Run a coroutine on the event loop thread and wait for its result.
+        
+        Excel COM objects and Tk windows belong to the calling (UI) thread,
+        so only the awaits run on the loop. While waiting, progress posted by
+        the coroutine is applied here and the progress dialog keeps handling
+        events; its Cancel button cancels the coroutine. Returns None if the
+        operation was cancelled.
+        """
+        future = self._submit(coro)
+        try:
+            while not future.done():
+                self._drain_progress_updates()
+                if self.progress_dialog.cancelled:
+                    future.cancel()
+                    break
+                self.progress_dialog.pump()
+                wait([future], timeout=UI_POLL_INTERVAL)
+        finally:
+            self._drain_progress_updates()
+        
+        if future.cancelled():
+            return None
+        return future.result()
+    
+    def _post_progress(self, progress: float, status: str):
+        """Queue a progress update from the event loop thread."""
+        self._progress_updates.put((progress, status))
+    
+    def _drain_progress_updates(self):
+        """Apply queued progress updates to the progress dialog."""
+        while True:
+            try:
+                progress, status = self._progress_updates.get_nowait()
+            except queue.Empty:
+                return
+            self.progress_dialog.update_progress(progress, status)
+    
+    # Analysis methods; these run on the UI thread and hand the Ollama and
+    # agent calls to the event loop through _run_on_loop
+    def _run_analysis(self, data, analysis_type):
         """Run analysis in background."""
         try:
             self.progress_dialog.update_progress(10, "Preparing data...")
@@ -340,15 +430,18 @@ class ExcelOllamaPlugin:
             # Validate and process data
             processed_data = self.data_processor.validate_data(data)
             if not processed_data.is_valid:
+                self.progress_dialog.hide()
                 self._show_error(f"Data validation failed: {processed_data.errors}")
                 return
             
             self.progress_dialog.update_progress(30, "Running analysis...")
             
             # Run analysis through agent controller
-            result = await self.agent_controller.execute_analysis_pipeline(
-                data, analysis_type
+            result = self._run_on_loop(
+                self.agent_controller.execute_analysis_pipeline(data, analysis_type)
             )
+            if result is None:
+                return
             
             self.progress_dialog.update_progress(80, "Formatting results...")
             
@@ -356,7 +449,7 @@ class ExcelOllamaPlugin:
             self.excel_interface.write_results_to_sheet(result, f"AI_{analysis_type}_Results")
             
             self.progress_dialog.update_progress(100, "Complete!")
-            self.progress_dialog.close()
+            self.progress_dialog.hide()
             
             # Show results dialog
             results_dialog = ResultsDialog(result)
@@ -365,44 +458,25 @@ class ExcelOllamaPlugin:
         except Exception as e:
             self.logger.error(f"Analysis failed: {e}")
             if self.progress_dialog:
-                self.progress_dialog.close()
+                self.progress_dialog.hide()
             self._show_error(f"Analysis failed: {e}")
     
-    async def _process_query(self, query, data):
+    def _process_query(self, query, data):
         """Process natural language query."""
         try:
             self.progress_dialog.update_progress(20, "Understanding query...")
             
-            # Process query
-            query_result = await self.query_processor.process_query(query, data)
-            
-            if 'error' in query_result:
-                self._show_error(f"Query processing failed: {query_result['error']}")
+            combined_result = self._run_on_loop(self._answer_query(query, data))
+            if combined_result is None:
                 return
             
-            self.progress_dialog.update_progress(50, "Executing analysis...")
-            
-            # Execute analysis based on query
-            analysis_spec = query_result['analysis_specification']
-            result = await self.agent_controller.execute_analysis_pipeline(
-                data, analysis_spec['method'], analysis_spec['parameters']
-            )
-            
-            self.progress_dialog.update_progress(80, "Formatting response...")
-            
-            # Format response
-            formatted_response = await self.query_formatter.format_response(query, result)
-            
-            # Combine query processing and analysis results
-            combined_result = {
-                'original_query': query,
-                'query_processing': query_result,
-                'analysis_result': result,
-                'formatted_response': formatted_response
-            }
+            if 'error' in combined_result:
+                self.progress_dialog.hide()
+                self._show_error(f"Query processing failed: {combined_result['error']}")
+                return
             
             self.progress_dialog.update_progress(100, "Complete!")
-            self.progress_dialog.close()
+            self.progress_dialog.hide()
             
             # Write results
             self.excel_interface.write_results_to_sheet(combined_result, "AI_Query_Results")
@@ -414,50 +488,49 @@ class ExcelOllamaPlugin:
         except Exception as e:
             self.logger.error(f"Query processing failed: {e}")
             if self.progress_dialog:
-                self.progress_dialog.close()
+                self.progress_dialog.hide()
             self._show_error(f"Query processing failed: {e}")
     
-    async def _generate_report(self, data):
+    async def _answer_query(self, query, data):
+        """Interpret a query, run the analysis it asks for and phrase the answer."""
+        # Process query
+        query_result = await self.query_processor.process_query(query, data)
+        
+        if 'error' in query_result:
+            return query_result
+        
+        self._post_progress(50, "Executing analysis...")
+        
+        # Execute analysis based on query
+        analysis_spec = query_result['analysis_specification']
+        result = await self.agent_controller.execute_analysis_pipeline(
+            data, analysis_spec['method'], analysis_spec['parameters']
+        )
+        
+        self._post_progress(80, "Formatting response...")
+        
+        # Format response
+        formatted_response = await self.query_formatter.format_response(query, result)
+        
+        # Combine query processing and analysis results
+        return {
+            'original_query': query,
+            'query_processing': query_result,
+            'analysis_result': result,
+            'formatted_response': formatted_response
+        }
+    
+    def _generate_report(self, data):
         """Generate comprehensive report."""
         try:
-            self.progress_dialog.update_progress(20, "Analyzing data...")
-            
-            # Run multiple analyses
-            analyses = {}
-            
-            # Statistical analysis
-            analyses['statistics'] = await self.agent_controller.execute_analysis_pipeline(
-                data, 'statistical_analysis'
-            )
-            
-            self.progress_dialog.update_progress(40, "Detecting patterns...")
-            
-            # Pattern analysis
-            analyses['patterns'] = await self.agent_controller.execute_analysis_pipeline(
-                data, 'pattern_detection'
-            )
-            
-            self.progress_dialog.update_progress(60, "Generating insights...")
-            
-            # Get reporting agent
-            reporting_agent = self.agent_controller.get_agent_by_type('reporting')
+            self.progress_dialog.update_progress(20, "Analyzing data and detecting patterns...")
             
-            # Generate comprehensive summary
-            report = await reporting_agent.generate_summary(analyses)
-            
-            self.progress_dialog.update_progress(80, "Creating report...")
-            
-            # Create formatted report
-            formatted_report = await reporting_agent.create_report('executive_summary', analyses)
-            
-            combined_result = {
-                'report': formatted_report,
-                'summary': report,
-                'detailed_analyses': analyses
-            }
+            combined_result = self._run_on_loop(self._build_report(data))
+            if combined_result is None:
+                return
             
             self.progress_dialog.update_progress(100, "Complete!")
-            self.progress_dialog.close()
+            self.progress_dialog.hide()
             
             # Write results
             self.excel_interface.write_results_to_sheet(combined_result, "AI_Report")
@@ -469,44 +542,51 @@ class ExcelOllamaPlugin:
         except Exception as e:
             self.logger.error(f"Report generation failed: {e}")
             if self.progress_dialog:
-                self.progress_dialog.close()
+                self.progress_dialog.hide()
             self._show_error(f"Report generation failed: {e}")
     
-    async def _create_dashboard(self, data):
+    async def _build_report(self, data):
+        """Run the report analyses and have the reporting agent write them up."""
+        # Statistical and pattern analyses run together as one batch
+        batch = await self.agent_controller.execute_batch(
+            data, ['statistical_analysis', 'pattern_detection']
+        )
+        analyses = {
+            'statistics': batch['statistical_analysis'],
+            'patterns': batch['pattern_detection']
+        }
+        
+        self._post_progress(60, "Generating insights...")
+        
+        # Get reporting agent
+        reporting_agent = self.agent_controller.get_agent_by_type('reporting')
+        
+        # Generate comprehensive summary
+        report = await reporting_agent.generate_summary(analyses)
+        
+        self._post_progress(80, "Creating report...")
+        
+        # Create formatted report
+        formatted_report = await reporting_agent.create_report('executive_summary', analyses)
+        
+        return {
+            'report': formatted_report,
+            'summary': report,
+            'detailed_analyses': analyses
+        }
+    
+    def _create_dashboard(self, data):
         """Create executive dashboard."""
         try:
             self.progress_dialog.update_progress(30, "Extracting key metrics...")
             
-            # Run analysis to get key metrics
-            analysis_result = await self.agent_controller.execute_analysis_pipeline(
-                data, 'statistical_analysis'
-            )
-            
-            self.progress_dialog.update_progress(60, "Building dashboard...")
-            
-            # Get reporting agent
-            reporting_agent = self.agent_controller.get_agent_by_type('reporting')
-            
-            # Extract key metrics
-            key_metrics = reporting_agent._extract_key_metrics(analysis_result)
-            
-            # Build dashboard
-            dashboard = await reporting_agent.build_dashboard(key_metrics)
-            
-            self.progress_dialog.update_progress(90, "Creating visualizations...")
-            
-            # Create visualizations in Excel
             data_characteristics = self.excel_interface.get_data_characteristics(data)
-            viz_recommendations = await reporting_agent.recommend_visualizations(data_characteristics)
-            
-            combined_result = {
-                'dashboard': dashboard,
-                'visualizations': viz_recommendations,
-                'key_metrics': key_metrics
-            }
+            combined_result = self._run_on_loop(self._build_dashboard(data, data_characteristics))
+            if combined_result is None:
+                return
             
             self.progress_dialog.update_progress(100, "Complete!")
-            self.progress_dialog.close()
+            self.progress_dialog.hide()
             
             # Write results
             self.excel_interface.write_results_to_sheet(combined_result, "AI_Dashboard")
@@ -522,16 +602,54 @@ class ExcelOllamaPlugin:
         except Exception as e:
             self.logger.error(f"Dashboard creation failed: {e}")
             if self.progress_dialog:
-                self.progress_dialog.close()
+                self.progress_dialog.hide()
             self._show_error(f"Dashboard creation failed: {e}")
     
-    async def _test_connection(self):
+    async def _build_dashboard(self, data, data_characteristics):
+        """Build the dashboard and its visualization recommendations."""
+        # Get reporting agent
+        reporting_agent = self.agent_controller.get_agent_by_type('reporting')
+        
+        async def build_dashboard():
+            # Run analysis to get key metrics
+            analysis_result = await self.agent_controller.execute_analysis_pipeline(
+                data, 'statistical_analysis'
+            )
+            
+            self._post_progress(60, "Building dashboard...")
+            
+            # Extract key metrics
+            key_metrics = reporting_agent._extract_key_metrics(analysis_result)
+            
+            # Build dashboard
+            return await reporting_agent.build_dashboard(key_metrics), key_metrics
+        
+        # Visualization recommendations only need the data
+        # characteristics, so they are requested alongside the dashboard
+        (dashboard, key_metrics), viz_recommendations = await asyncio.gather(
+            build_dashboard(),
+            reporting_agent.recommend_visualizations(data_characteristics)
+        )
+        
+        self._post_progress(90, "Creating visualizations...")
+        
+        return {
+            'dashboard': dashboard,
+            'visualizations': viz_recommendations,
+            'key_metrics': key_metrics
+        }
+    
+    def _test_connection(self):
         """Test connection to Ollama server."""
         try:
             self.excel_interface.update_ribbon_status("Testing connection...")
             
             # Test connection
-            models = await self.ollama_client.list_models()
+            models = self._run_on_loop(self.ollama_client.list_models())
+            self.progress_dialog.hide()
+            if models is None:
+                self.excel_interface.update_ribbon_status("Connection test cancelled")
+                return
             
             if models:
                 self.excel_interface.update_ribbon_status(f"Connected - {len(models)} models available")
@@ -542,6 +660,7 @@ class ExcelOllamaPlugin:
                 
         except Exception as e:
             self.logger.error(f"Connection test failed: {e}")
+            self.progress_dialog.hide()
             self.excel_interface.update_ribbon_status("Connection failed")
             self._show_error(f"Connection failed: {e}")
     
@@ -551,6 +670,7 @@ class ExcelOllamaPlugin:
             # Update Ollama client
             self.ollama_client.base_url = self.config.ollama.server_url
             self.ollama_client.timeout = self.config.ollama.timeout
+            self.ollama_client.clear_cache()
             
             # Update logging level
             logging.getLogger().setLevel(self.config.advanced.get('log_level', 'INFO'))
@@ -586,13 +706,30 @@ class ExcelOllamaPlugin:
             if self.excel_interface:
                 self.excel_interface.cleanup()
             
+            if self.progress_dialog:
+                self.progress_dialog.close()
+            
             if self.ollama_client:
-                asyncio.create_task(self.ollama_client.close())
+                self._submit(self.ollama_client.close()).result(timeout=SHUTDOWN_TIMEOUT)
             
             self.logger.info("Plugin cleanup completed")
             
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
+        
+        finally:
+            self._stop_loop()
+    
+    def _stop_loop(self):
+        """Stop the background event loop and wait for its thread to exit."""
+        if self._loop is None:
+            return
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=SHUTDOWN_TIMEOUT)
+        if not self._loop.is_running():
+            self._loop.close()
+        self._loop = None
 
 
 # Global plugin instance
@@ -12,6 +12,7 @@ import threading
 from datetime import datetime
 
 from ..utils.config import PluginConfig, OllamaConfig
+from ..core.interfaces import DataInfo
 
 
 class ConfigurationDialog:
@@ -83,15 +84,15 @@ class ConfigurationDialog:
         server_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(server_group, text="Server URL:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.server_url_var = tk.StringVar(value=self.config.ollama.server_url)
+        self.server_url_var = tk.StringVar(master=self.root, value=self.config.ollama.server_url)
         ttk.Entry(server_group, textvariable=self.server_url_var, width=40).grid(row=0, column=1, sticky=tk.W, pady=2)
         
         ttk.Label(server_group, text="Timeout (seconds):").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.timeout_var = tk.StringVar(value=str(self.config.ollama.timeout))
+        self.timeout_var = tk.StringVar(master=self.root, value=str(self.config.ollama.timeout))
         ttk.Entry(server_group, textvariable=self.timeout_var, width=10).grid(row=1, column=1, sticky=tk.W, pady=2)
         
         ttk.Label(server_group, text="Max Retries:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        self.max_retries_var = tk.StringVar(value=str(self.config.ollama.max_retries))
+        self.max_retries_var = tk.StringVar(master=self.root, value=str(self.config.ollama.max_retries))
         ttk.Entry(server_group, textvariable=self.max_retries_var, width=10).grid(row=2, column=1, sticky=tk.W, pady=2)
         
         # Model Settings
@@ -99,14 +100,14 @@ class ConfigurationDialog:
         model_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(model_group, text="Default Model:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.default_model_var = tk.StringVar(value=self.config.ollama.default_model)
+        self.default_model_var = tk.StringVar(master=self.root, value=self.config.ollama.default_model)
         self.model_combo = ttk.Combobox(model_group, textvariable=self.default_model_var, width=30)
         self.model_combo.grid(row=0, column=1, sticky=tk.W, pady=2)
         
         ttk.Button(model_group, text="Refresh Models", 
                   command=self._refresh_models).grid(row=0, column=2, padx=5)
         
-        self.stream_responses_var = tk.BooleanVar(value=self.config.ollama.stream_responses)
+        self.stream_responses_var = tk.BooleanVar(master=self.root, value=self.config.ollama.stream_responses)
         ttk.Checkbutton(model_group, text="Enable streaming responses", 
                        variable=self.stream_responses_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=2)
         
@@ -127,13 +128,13 @@ class ConfigurationDialog:
         defaults_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(defaults_group, text="Default Analysis Type:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.default_analysis_var = tk.StringVar(value="statistical_analysis")
+        self.default_analysis_var = tk.StringVar(master=self.root, value="statistical_analysis")
         analysis_combo = ttk.Combobox(defaults_group, textvariable=self.default_analysis_var, 
                                     values=["statistical_analysis", "trend_analysis", "pattern_detection", "clustering"])
         analysis_combo.grid(row=0, column=1, sticky=tk.W, pady=2)
         
         ttk.Label(defaults_group, text="Auto-detect data types:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.auto_detect_var = tk.BooleanVar(value=True)
+        self.auto_detect_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(defaults_group, variable=self.auto_detect_var).grid(row=1, column=1, sticky=tk.W, pady=2)
         
         # Performance Settings
@@ -141,14 +142,14 @@ class ConfigurationDialog:
         perf_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(perf_group, text="Max rows for analysis:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.max_rows_var = tk.StringVar(value="100000")
+        self.max_rows_var = tk.StringVar(master=self.root, value="100000")
         ttk.Entry(perf_group, textvariable=self.max_rows_var, width=10).grid(row=0, column=1, sticky=tk.W, pady=2)
         
         ttk.Label(perf_group, text="Chunk size for large datasets:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.chunk_size_var = tk.StringVar(value="10000")
+        self.chunk_size_var = tk.StringVar(master=self.root, value="10000")
         ttk.Entry(perf_group, textvariable=self.chunk_size_var, width=10).grid(row=1, column=1, sticky=tk.W, pady=2)
         
-        self.parallel_processing_var = tk.BooleanVar(value=True)
+        self.parallel_processing_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(perf_group, text="Enable parallel processing", 
                        variable=self.parallel_processing_var).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=2)
     
@@ -158,15 +159,15 @@ class ConfigurationDialog:
         display_group = ttk.LabelFrame(parent, text="Display Settings", padding=10)
         display_group.pack(fill=tk.X, padx=10, pady=5)
         
-        self.show_progress_var = tk.BooleanVar(value=True)
+        self.show_progress_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(display_group, text="Show progress indicators", 
                        variable=self.show_progress_var).pack(anchor=tk.W, pady=2)
         
-        self.auto_open_results_var = tk.BooleanVar(value=True)
+        self.auto_open_results_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(display_group, text="Auto-open results sheet", 
                        variable=self.auto_open_results_var).pack(anchor=tk.W, pady=2)
         
-        self.show_confidence_var = tk.BooleanVar(value=True)
+        self.show_confidence_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(display_group, text="Show confidence scores", 
                        variable=self.show_confidence_var).pack(anchor=tk.W, pady=2)
         
@@ -174,11 +175,11 @@ class ConfigurationDialog:
         notif_group = ttk.LabelFrame(parent, text="Notifications", padding=10)
         notif_group.pack(fill=tk.X, padx=10, pady=5)
         
-        self.notify_completion_var = tk.BooleanVar(value=True)
+        self.notify_completion_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(notif_group, text="Notify when analysis completes", 
                        variable=self.notify_completion_var).pack(anchor=tk.W, pady=2)
         
-        self.notify_errors_var = tk.BooleanVar(value=True)
+        self.notify_errors_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(notif_group, text="Show error notifications", 
                        variable=self.notify_errors_var).pack(anchor=tk.W, pady=2)
     
@@ -189,12 +190,12 @@ class ConfigurationDialog:
         logging_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(logging_group, text="Log Level:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.log_level_var = tk.StringVar(value="INFO")
+        self.log_level_var = tk.StringVar(master=self.root, value="INFO")
         log_combo = ttk.Combobox(logging_group, textvariable=self.log_level_var, 
                                values=["DEBUG", "INFO", "WARNING", "ERROR"])
         log_combo.grid(row=0, column=1, sticky=tk.W, pady=2)
         
-        self.enable_logging_var = tk.BooleanVar(value=True)
+        self.enable_logging_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(logging_group, text="Enable logging", 
                        variable=self.enable_logging_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=2)
         
@@ -202,11 +203,11 @@ class ConfigurationDialog:
         security_group = ttk.LabelFrame(parent, text="Security", padding=10)
         security_group.pack(fill=tk.X, padx=10, pady=5)
         
-        self.encrypt_cache_var = tk.BooleanVar(value=True)
+        self.encrypt_cache_var = tk.BooleanVar(master=self.root, value=True)
         ttk.Checkbutton(security_group, text="Encrypt cached data", 
                        variable=self.encrypt_cache_var).pack(anchor=tk.W, pady=2)
         
-        self.clear_cache_on_exit_var = tk.BooleanVar(value=False)
+        self.clear_cache_on_exit_var = tk.BooleanVar(master=self.root, value=False)
         ttk.Checkbutton(security_group, text="Clear cache on exit", 
                        variable=self.clear_cache_on_exit_var).pack(anchor=tk.W, pady=2)
         
@@ -215,7 +216,7 @@ class ConfigurationDialog:
         cache_group.pack(fill=tk.X, padx=10, pady=5)
         
         ttk.Label(cache_group, text="Cache size (MB):").grid(row=0, column=0, sticky=tk.W, pady=2)
-        self.cache_size_var = tk.StringVar(value="100")
+        self.cache_size_var = tk.StringVar(master=self.root, value="100")
         ttk.Entry(cache_group, textvariable=self.cache_size_var, width=10).grid(row=0, column=1, sticky=tk.W, pady=2)
         
         ttk.Button(cache_group, text="Clear Cache", 
@@ -336,8 +337,8 @@ class ConfigurationDialog:
 class QueryDialog:
     """Dialog for natural language queries."""
     
-    def __init__(self, data_info: Dict[str, Any] = None):
-        self.data_info = data_info or {}
+    def __init__(self, data_info: Optional[DataInfo] = None):
+        self.data_info = data_info
         self.root = None
         self.result = None
     
@@ -352,14 +353,13 @@ class QueryDialog:
             info_frame = ttk.LabelFrame(self.root, text="Data Information", padding=10)
             info_frame.pack(fill=tk.X, padx=10, pady=5)
             
-            info_text = f"Rows: {self.data_info.get('rows', 'Unknown')}, Columns: {self.data_info.get('columns', 'Unknown')}"
+            info_text = f"Rows: {self.data_info.rows}, Columns: {self.data_info.columns}"
             ttk.Label(info_frame, text=info_text).pack(anchor=tk.W)
             
-            if 'column_names' in self.data_info:
-                columns_text = f"Columns: {', '.join(self.data_info['column_names'][:5])}"
-                if len(self.data_info['column_names']) > 5:
-                    columns_text += "..."
-                ttk.Label(info_frame, text=columns_text).pack(anchor=tk.W)
+            columns_text = f"Columns: {', '.join(map(str, self.data_info.column_names[:5]))}"
+            if self.data_info.columns > 5:
+                columns_text += "..."
+            ttk.Label(info_frame, text=columns_text).pack(anchor=tk.W)
         
         # Query input section
         query_frame = ttk.LabelFrame(self.root, text="Your Question", padding=10)
@@ -427,7 +427,12 @@ class QueryDialog:
 
 
 class ProgressDialog:
-    """Progress dialog for long-running operations."""
+    """Progress dialog for long-running operations.
+    
+    The window is built on first ``show()`` and then reused: ``reset()``
+    retitles it for the next operation and ``hide()`` withdraws it until
+    then. ``close()`` destroys it for good.
+    """
     
     def __init__(self, title: str = "Processing", message: str = "Please wait..."):
         self.title = title
@@ -435,26 +440,44 @@ class ProgressDialog:
         self.root = None
         self.progress_var = None
         self.status_var = None
+        self.message_var = None
         self.cancelled = False
     
+    def reset(self, title: str, message: str):
+        """Prepare the dialog for a new operation."""
+        self.title = title
+        self.message = message
+        self.cancelled = False
+        if self.root:
+            self.root.title(title)
+            self.message_var.set(message)
+            self.progress_var.set(0)
+            self.status_var.set("Initializing...")
+    
     def show(self):
         """Show progress dialog."""
+        if self.root:
+            self.root.deiconify()
+            self.root.update()
+            return
+        
         self.root = tk.Tk()
         self.root.title(self.title)
         self.root.geometry("400x150")
         self.root.resizable(False, False)
         
         # Message
-        ttk.Label(self.root, text=self.message).pack(pady=10)
+        self.message_var = tk.StringVar(master=self.root, value=self.message)
+        ttk.Label(self.root, textvariable=self.message_var).pack(pady=10)
         
         # Progress bar
-        self.progress_var = tk.DoubleVar()
+        self.progress_var = tk.DoubleVar(master=self.root)
         progress_bar = ttk.Progressbar(self.root, variable=self.progress_var, 
                                      maximum=100, length=300)
         progress_bar.pack(pady=10)
         
         # Status label
-        self.status_var = tk.StringVar(value="Initializing...")
+        self.status_var = tk.StringVar(master=self.root, value="Initializing...")
         ttk.Label(self.root, textvariable=self.status_var).pack(pady=5)
         
         # Cancel button
@@ -477,6 +500,16 @@ class ProgressDialog:
         if self.root:
             self.root.update()
     
+    def pump(self):
+        """Process pending window events, e.g. a click on Cancel."""
+        if self.root:
+            self.root.update()
+    
+    def hide(self):
+        """Hide progress dialog, keeping it for the next operation."""
+        if self.root:
+            self.root.withdraw()
+    
     def close(self):
         """Close progress dialog."""
         if self.root:
@@ -491,7 +524,7 @@ class ProgressDialog:
     def _cancel(self):
         """Cancel operation."""
         self.cancelled = True
-        self.close()
+        self.hide()
 
 
 class ResultsDialog:
@@ -0,0 +1,17 @@
+"""
+Compatibility helpers shared across the plugin.
+"""
+
+import sys
+
+# Slotted dataclasses are only available on Python 3.10+; use as
+# ``@dataclass(**DATACLASS_SLOTS)``
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# orjson is optional; callers fall back to the json module without it
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
@@ -22,6 +22,8 @@ class OllamaConfig:
     api_key: str = ""  # For future authentication support
     verify_ssl: bool = True  # SSL verification for HTTPS connections
     connection_test_timeout: int = 10  # Timeout for connection tests
+    max_connections: int = 32  # Pooled connections to the Ollama server
+    max_concurrent_generations: int = 4  # Generate requests in flight at once
     
     def __post_init__(self):
         if self.model_parameters is None:
@@ -37,6 +39,7 @@ class ExcelSettings:
     """Excel-specific configuration settings."""
     auto_refresh: bool = True
     max_rows_per_chunk: int = 10000
+    inference_sample_size: int = 10000
     default_chart_type: str = "line"
     enable_custom_functions: bool = True
     ribbon_position: str = "right"
@@ -180,10 +183,19 @@ class ConfigManager:
         if self._config.ollama.max_retries < 0:
             errors.append("Max retries cannot be negative")
         
+        if self._config.ollama.max_connections <= 0:
+            errors.append("Max connections must be positive")
+        
+        if self._config.ollama.max_concurrent_generations <= 0:
+            errors.append("Max concurrent generations must be positive")
+        
         # Validate Excel settings
         if self._config.excel_settings.max_rows_per_chunk <= 0:
             errors.append("Max rows per chunk must be positive")
         
+        if self._config.excel_settings.inference_sample_size <= 0:
+            errors.append("Inference sample size must be positive")
+        
         # Validate agent settings
         if not 0 <= self._config.agent_settings.analysis_confidence_threshold <= 1:
             errors.append("Analysis confidence threshold must be between 0 and 1")
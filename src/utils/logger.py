@@ -2,12 +2,18 @@
 Logging utilities for Excel-Ollama AI Plugin.
 """
 
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional
 
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
 def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> logging.Logger:
     """Set up logging configuration for the plugin."""
     
@@ -23,7 +29,7 @@ def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> loggin
     # Configure logging
     logging.basicConfig(
         level=getattr(logging, level.upper(), logging.INFO),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=LOG_FORMAT,
         handlers=[
             logging.FileHandler(log_file, encoding='utf-8'),
             logging.StreamHandler()  # Also log to console
@@ -38,4 +44,36 @@ def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> loggin
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
-    return logging.getLogger(f'ExcelOllamaPlugin.{name}')
\ No newline at end of file
+    return logging.getLogger(f'ExcelOllamaPlugin.{name}')
+
+
+class _AncestorHandler(logging.Handler):
+    """Hands records to a logger's ancestors, as propagation would."""
+    
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self._logger = logger
+    
+    def emit(self, record: logging.LogRecord):
+        parent = self._logger.parent
+        if parent is not None:
+            parent.handle(record)
+
+
+def get_queued_logger(name: str) -> logging.Logger:
+    """Get a logger whose records are handled from a background thread.
+    
+    Use this from code running on the asyncio event loop so that logging
+    never blocks the loop on file or stream I/O. Records still reach the
+    handlers configured by ``setup_logging``, including the log file.
+    """
+    logger = get_logger(name)
+    if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        log_queue = queue.Queue()
+        listener = QueueListener(log_queue, _AncestorHandler(logger))
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+        # The listener forwards to the ancestors' handlers instead
+        logger.propagate = False
+    return logger
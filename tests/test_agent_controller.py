@@ -6,15 +6,10 @@ import pytest
 import asyncio
 import pandas as pd
 from unittest.mock import Mock, AsyncMock
-import sys
-import os
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from core.agent_controller import AgentController, AnalysisTask, AnalysisResult
-from core.interfaces import IOllamaClient
-from agents.base_agent import BaseAgent, AgentCapability, AgentMessage, MessageType
+from src.core.agent_controller import AgentController, AnalysisTask, AnalysisResult
+from src.core.interfaces import IOllamaClient
+from src.agents.base_agent import BaseAgent, AgentCapability, AgentMessage, MessageType, AgentStatus
 
 
 class MockAgent(BaseAgent):
@@ -154,6 +149,23 @@ async def test_analysis_pipeline(agent_controller, sample_data):
         await agent_controller.stop()
 
 
+@pytest.mark.asyncio
+async def test_execute_batch(agent_controller, sample_data):
+    """Test several analyses of the same data run as one batch."""
+    agent_controller.register_agent_type("mock", MockAgent)
+    agent_controller.create_agent("mock")
+    
+    # Batches go straight to the agents, without the worker tasks
+    results = await agent_controller.execute_batch(
+        sample_data, ["test_analysis", "unknown_analysis"]
+    )
+    
+    assert set(results) == {"test_analysis", "unknown_analysis"}
+    assert results["test_analysis"].results["test"] == "success"
+    assert results["unknown_analysis"].methodology == "error"
+    assert results["test_analysis"].task_id in agent_controller.results_cache
+
+
 @pytest.mark.asyncio
 async def test_no_capable_agents(agent_controller, sample_data):
     """Test handling when no agents can handle the task."""
@@ -181,6 +193,38 @@ async def test_no_capable_agents(agent_controller, sample_data):
         await agent_controller.stop()
 
 
+@pytest.mark.asyncio
+async def test_result_wakes_waiter(agent_controller):
+    """Test that waiters are woken as soon as a result is stored."""
+    waiter = asyncio.create_task(agent_controller.get_analysis_result("late_task", timeout=5.0))
+    await asyncio.sleep(0)
+    
+    result = AnalysisResult(
+        task_id="late_task",
+        agent_id="test_agent",
+        results={"test": "late"},
+        confidence_score=0.5,
+        methodology="test"
+    )
+    await agent_controller._store_result(result)
+    
+    assert await asyncio.wait_for(waiter, timeout=1.0) is result
+    
+    # Missing results still time out
+    assert await agent_controller.get_analysis_result("missing_task", timeout=0.05) is None
+
+
+def test_results_condition_follows_event_loop(agent_controller):
+    """Test the result condition is created on, and rebuilt for, the running loop."""
+    async def condition():
+        return agent_controller._results_condition()
+    
+    first = asyncio.run(condition())
+    second = asyncio.run(condition())
+    assert first is not second
+    assert agent_controller._results_cv is second
+
+
 @pytest.mark.asyncio
 async def test_message_routing(agent_controller):
     """Test message routing between agents."""
@@ -213,6 +257,49 @@ async def test_message_routing(agent_controller):
         await agent_controller.stop()
 
 
+@pytest.mark.asyncio
+async def test_send_message_and_await(agent_controller):
+    """Test direct request/response with a local agent."""
+    agent_controller.register_agent_type("mock", MockAgent)
+    agent_id = agent_controller.create_agent("mock")
+    
+    message = AgentMessage(
+        sender="test_sender",
+        recipient=agent_id,
+        message_type=MessageType.REQUEST,
+        payload={"test": "data"}
+    )
+    
+    response = await agent_controller.send_message_and_await(message)
+    
+    assert response.message_type == MessageType.RESPONSE
+    assert response.correlation_id == message.id
+    assert response.payload["results"]["test"] == "success"
+    assert agent_controller.message_queue.qsize() == 0
+
+
+
+@pytest.mark.asyncio
+async def test_send_message_and_await_times_out_locally(agent_controller):
+    """Test the timeout also bounds direct calls to local agents."""
+    agent_controller.register_agent_type("mock", MockAgent)
+    agent_id = agent_controller.create_agent("mock")
+    
+    async def slow_process_message(message):
+        await asyncio.sleep(5)
+    
+    agent_controller.get_agent(agent_id).process_message = slow_process_message
+    message = AgentMessage(
+        sender="test_sender",
+        recipient=agent_id,
+        message_type=MessageType.REQUEST,
+        payload={}
+    )
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await agent_controller.send_message_and_await(message, timeout=0.05)
+
+
 def test_data_type_determination(agent_controller):
     """Test data type determination logic."""
     # Time series data
@@ -256,6 +343,59 @@ def test_system_status(agent_controller):
     assert status["agents"][agent_id]["agent_id"] == agent_id
 
 
+def test_system_status_tracks_agent_transitions(agent_controller):
+    """Test that cached system status is refreshed on agent state changes."""
+    agent_controller.register_agent_type("mock", MockAgent)
+    agent_id = agent_controller.create_agent("mock")
+    
+    status = agent_controller.get_system_status()
+    assert status["agents"][agent_id]["status"] == "idle"
+    
+    # Callers get a copy, so mutating it leaves the cache intact
+    status["agents"][agent_id]["status"] = "tampered"
+    assert agent_controller.get_system_status()["agents"][agent_id]["status"] == "idle"
+    
+    agent_controller.get_agent(agent_id).status = AgentStatus.BUSY
+    status = agent_controller.get_system_status()
+    assert status["agents"][agent_id]["status"] == "busy"
+
+
+@pytest.mark.asyncio
+async def test_system_status_counters_are_live(agent_controller, sample_data):
+    """Test queue sizes and the running flag are not held by the status cache."""
+    status = agent_controller.get_system_status()
+    assert status["task_queue_size"] == 0
+    assert status["running"] is False
+    
+    task = AnalysisTask(task_id="queued", data=sample_data, analysis_type="test_analysis", parameters={})
+    await agent_controller.submit_analysis_task(task)
+    agent_controller.running = True
+    
+    status = agent_controller.get_system_status()
+    assert status["task_queue_size"] == 1
+    assert status["running"] is True
+
+
+
+@pytest.mark.asyncio
+async def test_system_status_agent_cache_size_is_live(agent_controller):
+    """Test agent cache sizes are current even without a state transition."""
+    agent_controller.register_agent_type("mock", MockAgent)
+    agent_id = agent_controller.create_agent("mock")
+    assert agent_controller.get_system_status()["agents"][agent_id]["cache_size"] == 0
+    
+    response = AgentMessage(
+        sender="other",
+        recipient=agent_id,
+        message_type=MessageType.RESPONSE,
+        payload={"ok": True},
+        correlation_id="request_1"
+    )
+    await agent_controller.get_agent(agent_id)._handle_response(response)
+    
+    assert agent_controller.get_system_status()["agents"][agent_id]["cache_size"] == 1
+
+
 def test_cache_clearing(agent_controller):
     """Test results cache clearing."""
     # Add some results to cache
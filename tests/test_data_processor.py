@@ -112,6 +112,15 @@ class TestDataProcessor:
         assert not cleaned['numeric'].isnull().any()
         assert cleaned['numeric'].iloc[2] == 3.0  # Mean of [1,2,4,5]
     
+    def test_clean_data_leaves_input_untouched(self, processor, messy_data):
+        """Test that cleaning does not modify the caller's DataFrame."""
+        original = messy_data.copy()
+        rules = CleaningRules(missing_value_strategy=CleaningStrategy.FILL_MODE)
+        cleaned = processor.clean_data(messy_data, rules)
+        
+        pd.testing.assert_frame_equal(messy_data, original)
+        assert not cleaned['text'].isnull().any()
+    
     def test_clean_data_remove_duplicates(self, processor):
         """Test removing duplicate rows."""
         data = pd.DataFrame({
@@ -124,6 +133,23 @@ class TestDataProcessor:
         
         assert len(cleaned) == 3  # One duplicate removed
     
+    def test_convert_data_types(self, processor):
+        """Test conversion of text columns to compact native types."""
+        data = pd.DataFrame({
+            'ints': ['1', '2', '300', '4'],
+            'halves': ['0.5', '1.5', None, '2.5'],
+            'prices': ['0.1', '0.2', '0.3', '0.4'],
+            'flags': ['yes', 'no', None, 'Yes']
+        })
+        
+        converted = processor._convert_data_types(data)
+        
+        assert converted['ints'].dtype == np.int16
+        assert converted['halves'].dtype == np.float32
+        assert converted['prices'].dtype == np.float64
+        assert converted['flags'].dtype == 'boolean'
+        assert converted['flags'].tolist() == [True, False, pd.NA, True]
+    
     def test_chunk_large_dataset_small(self, processor, sample_data):
         """Test chunking small dataset."""
         chunks = list(processor.chunk_large_dataset(sample_data))
@@ -148,6 +174,20 @@ class TestDataProcessor:
         assert len(chunks[1]) == 10000
         assert len(chunks[2]) == 5000
     
+    def test_detect_data_types_cached(self, processor, sample_data):
+        """Test that type detection is reused for the same DataFrame."""
+        first = processor.detect_data_types(sample_data)
+        
+        with patch.object(processor, '_infer_column_values') as infer:
+            second = processor.detect_data_types(sample_data)
+        infer.assert_not_called()
+        
+        assert second == first
+        
+        # Layout changes produce a fresh detection
+        sample_data['extra'] = ['x'] * len(sample_data)
+        assert 'extra' in processor.detect_data_types(sample_data)
+    
     def test_handle_missing_values_auto(self, processor):
         """Test automatic missing value handling."""
         # Low missing percentage - should drop
@@ -171,6 +211,17 @@ class TestDataProcessor:
         assert 0 <= metrics.consistency_score <= 1
         assert 0 <= metrics.validity_score <= 1
     
+    def test_get_data_quality_metrics_reuses_validation_types(self, processor, messy_data):
+        """Test that metrics reuse types detected during validation."""
+        validation = processor.validate_data(messy_data)
+        
+        with patch.object(processor, '_detect_with_values') as detect:
+            metrics = processor.get_data_quality_metrics(messy_data, validation.data_types)
+        detect.assert_not_called()
+        
+        assert metrics.data_types == validation.data_types
+        assert 0 <= metrics.validity_score <= 1
+    
     def test_import_csv(self, processor):
         """Test CSV import."""
         # Create temporary CSV file
@@ -236,6 +287,49 @@ class TestDataProcessor:
             import os
             os.unlink(xml_path)
     
+    def test_infer_column_precedence(self, processor):
+        """Test single-pass column type inference."""
+        assert processor._infer_column(pd.Series([1.5, 2, 3])) == DataType.NUMERIC.value
+        assert processor._infer_column(pd.Series(['Yes', 'no'])) == DataType.BOOLEAN.value
+        assert processor._infer_column(pd.Series(pd.date_range('2023-01-01', periods=3))) == DataType.DATETIME.value
+        assert processor._infer_column(pd.Series(['2023-01-01', '2023-02-01'])) == DataType.DATETIME.value
+        assert processor._infer_column(pd.Series(['cat1', 'cat2'] * 20)) == DataType.CATEGORICAL.value
+        assert processor._infer_column(pd.Series(['alpha', 'beta', 'gamma'])) == DataType.TEXT.value
+        assert processor._infer_column(pd.Series([None, None])) == DataType.UNKNOWN.value
+    
+    def test_numeric_flag_columns_stay_numeric(self, processor):
+        """Test native 0/1 and constant number columns are numeric and valid."""
+        data = pd.DataFrame({
+            'flag': [0.0, 1.0, 1.0, 0.0, np.nan],
+            'x': [1.5, 2.5, 3.5, 4.5, 5.5],
+            'ones': [1] * 5
+        })
+        
+        result = processor.validate_data(data)
+        
+        assert result.is_valid
+        assert result.data_types == {
+            'flag': DataType.NUMERIC.value,
+            'x': DataType.NUMERIC.value,
+            'ones': DataType.NUMERIC.value
+        }
+        assert processor._infer_column(pd.Series(['0', '1', '1'])) == DataType.BOOLEAN.value
+        assert processor._validate_boolean(pd.Series([0.0, 1.0, None])) == []
+    
+    def test_convert_numeric_booleans(self, processor):
+        """Test 0/1 columns stored as float text or objects convert without loss."""
+        data = pd.DataFrame({
+            'text_floats': ['1.0', '0.0', '1.0', None],
+            'object_floats': pd.Series([1.0, 0.0, 0.0, 1.0], dtype=object),
+            'words': ['yes', 'no', None, 'Yes']
+        })
+        
+        converted = processor._convert_data_types(data, inference_method='full')
+        
+        assert converted['text_floats'].tolist() == [True, False, True, pd.NA]
+        assert converted['object_floats'].tolist() == [True, False, False, True]
+        assert converted['words'].tolist() == [True, False, pd.NA, True]
+    
     def test_detect_numeric_type(self, processor):
         """Test numeric type detection."""
         numeric_series = pd.Series([1, 2, 3, 4, 5])
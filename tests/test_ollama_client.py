@@ -6,10 +6,58 @@ import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 import json
+from collections.abc import Mapping
 
 from src.core.ollama_client import OllamaClient, ModelStatus, CircuitBreaker
 
 
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response used as a context manager."""
+    
+    def __init__(self, payload=None, status=200, lines=()):
+        self.status = status
+        self._body = json.dumps(payload).encode() if payload is not None else b""
+        self._lines = [json.dumps(line).encode() + b"\n" for line in lines]
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise Exception(f"HTTP {self.status}")
+    
+    async def read(self):
+        return self._body
+    
+    @property
+    def content(self):
+        return StreamContent(self._lines)
+
+
+class StreamContent:
+    """Streamed body handed out in small blocks that split lines apart."""
+    
+    def __init__(self, lines, block_size=7):
+        body = b"".join(lines)
+        self._blocks = [body[i:i + block_size] for i in range(0, len(body), block_size)]
+    
+    async def iter_chunked(self, n):
+        for block in self._blocks:
+            yield block
+
+
+def fake_session(*results):
+    """Session whose successive requests return (or raise) ``results``."""
+    session = Mock()
+    session.closed = False
+    session.close = AsyncMock()
+    session.request.side_effect = list(results)
+    return session
+
+
 class TestCircuitBreaker:
     """Test circuit breaker functionality."""
     
@@ -54,6 +102,19 @@ class TestCircuitBreaker:
         assert cb.state == "closed"
 
 
+class TestBackoff:
+    """Test retry backoff delays."""
+    
+    def test_backoff_stays_within_bounds(self):
+        """Test jittered delays grow from the base and never pass the cap."""
+        from src.core.ollama_client import _next_backoff, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+        
+        delay = RETRY_BASE_DELAY
+        for _ in range(50):
+            previous, delay = delay, _next_backoff(delay)
+            assert RETRY_BASE_DELAY <= delay <= min(RETRY_MAX_DELAY, previous * 3)
+
+
 class TestOllamaClient:
     """Test Ollama client functionality."""
     
@@ -76,7 +137,7 @@ class TestOllamaClient:
         assert client.current_model is None
         assert isinstance(client.model_config, dict)
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_test_connection_success(self, mock_request, client):
         """Test successful connection test."""
         mock_request.return_value.status_code = 200
@@ -85,7 +146,7 @@ class TestOllamaClient:
         assert result is True
         mock_request.assert_called_once()
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_test_connection_failure(self, mock_request, client):
         """Test failed connection test."""
         mock_request.side_effect = Exception("Connection failed")
@@ -93,12 +154,21 @@ class TestOllamaClient:
         result = client.test_connection()
         assert result is False
     
-    @patch('requests.request')
-    def test_list_models(self, mock_request, client):
+    @patch('requests.Session.request')
+    def test_sync_requests_reuse_session(self, mock_request, client):
+        """Test repeated sync requests share one pooled session."""
+        mock_request.return_value.status_code = 200
+        
+        client.test_connection()
+        session = client._sync_session
+        client.test_connection()
+        
+        assert client._sync_session is session
+        assert mock_request.call_count == 2
+    
+    def test_list_models(self, client):
         """Test listing models."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        client._session = fake_session(FakeResponse({
             "models": [
                 {
                     "name": "llama2",
@@ -107,8 +177,7 @@ class TestOllamaClient:
                     "digest": "abc123"
                 }
             ]
-        }
-        mock_request.return_value = mock_response
+        }))
         
         result = asyncio.run(client.list_models())
         
@@ -116,47 +185,170 @@ class TestOllamaClient:
         assert "llama2" in client.available_models
         assert client.available_models["llama2"].status == ModelStatus.AVAILABLE
     
-    @patch('requests.request')
-    def test_load_model_success(self, mock_request, client):
+    def test_load_model_success(self, client):
         """Test successful model loading."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": "Hello"}
-        mock_request.return_value = mock_response
+        client._session = fake_session(
+            FakeResponse({"modelfile": "FROM llama2"}),
+            FakeResponse({"response": "", "done": True})
+        )
         
         result = asyncio.run(client.load_model("llama2"))
         
         assert result is True
         assert client.current_model == "llama2"
+        
+        # Metadata probe first, then a preload with an empty prompt
+        show, preload = client._session.request.call_args_list
+        assert show.args[1].endswith("/api/show")
+        assert json.loads(preload.kwargs["data"])["prompt"] == ""
     
-    @patch('requests.request')
-    def test_load_model_failure(self, mock_request, client):
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_load_model_failure(self, mock_sleep, client):
         """Test failed model loading."""
-        mock_request.side_effect = Exception("Model not found")
+        client._session = fake_session(*[FakeResponse(status=404)] * (client.max_retries + 1))
         
         result = asyncio.run(client.load_model("nonexistent"))
         
         assert result is False
         assert client.current_model is None
     
-    @patch('requests.request')
-    def test_generate_response(self, mock_request, client):
+    def test_generate_response(self, client):
         """Test response generation."""
-        # First call to load model
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": "Hello"}
-        mock_request.return_value = mock_response
+        # First two calls to load model, third to generate
+        client._session = fake_session(
+            FakeResponse({"modelfile": "FROM llama2"}),
+            FakeResponse({"response": "", "done": True}),
+            FakeResponse({"response": "Test response"})
+        )
         
         # Load model first
         asyncio.run(client.load_model("llama2"))
         
         # Test generation
-        mock_response.json.return_value = {"response": "Test response"}
         result = asyncio.run(client.generate_response("Test prompt"))
         
         assert result == "Test response"
     
+    def test_generate_streaming_response(self, client):
+        """Test streamed generation joins the chunks until done."""
+        client.current_model = "llama2"
+        client._session = fake_session(FakeResponse(lines=[
+            {"response": "Hello", "done": False},
+            {"response": " world", "done": True},
+            {"response": " ignored", "done": False}
+        ]))
+        
+        result = asyncio.run(client.generate_response("Test prompt", stream=True))
+        
+        assert result == "Hello world"
+        assert client._session.request.call_args[0][:1] == ("POST",)
+    
+    def test_generate_concurrency_limit(self, client):
+        """Test concurrent generations are capped by the semaphore."""
+        client.current_model = "llama2"
+        client.max_concurrent_generations = 2
+        in_flight = []
+        peak = []
+        
+        async def fake_request(*args, **kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return {"response": "ok"}
+        
+        client._request_json = fake_request
+        
+        async def run():
+            return await asyncio.gather(*(client.generate_response(f"p{i}") for i in range(6)))
+        
+        assert asyncio.run(run()) == ["ok"] * 6
+        assert max(peak) == 2
+    
+    def test_generation_semaphore_follows_event_loop(self, client):
+        """Test the semaphore is created on, and rebuilt for, the running loop."""
+        async def slots():
+            return client._generation_slots()
+        
+        first = asyncio.run(slots())
+        second = asyncio.run(slots())
+        assert first is not second
+        assert client._gen_sem is second
+    
+    def test_generate_batch_resolves_each_request(self, client):
+        """Test queued generations each get their own response or error."""
+        client.current_model = "llama2"
+        
+        async def fake_request(method, url, json=None):
+            if json["prompt"] == "bad":
+                raise Exception("Generation failed")
+            return {"response": json["prompt"].upper()}
+        
+        client._request_json = fake_request
+        
+        async def run():
+            return await asyncio.gather(
+                client.generate_response("a"),
+                client.generate_response("bad"),
+                client.generate_response("b"),
+                return_exceptions=True
+            )
+        
+        first, failed, second = asyncio.run(run())
+        assert (first, second) == ("A", "B")
+        assert str(failed) == "Generation failed"
+    
+    def test_deterministic_responses_are_cached(self, client):
+        """Test repeated deterministic prompts skip the server."""
+        client.current_model = "llama2"
+        client.configure_model_parameters(temperature=0)
+        client._session = fake_session(
+            FakeResponse({"response": "First"}),
+            FakeResponse({"response": "Second"})
+        )
+        
+        assert asyncio.run(client.generate_response("Same prompt")) == "First"
+        assert asyncio.run(client.generate_response("Same prompt")) == "First"
+        assert client._session.request.call_count == 1
+        
+        # Sampled generations are never served from the cache
+        client.configure_model_parameters(temperature=0.7)
+        assert asyncio.run(client.generate_response("Same prompt")) == "Second"
+    
+    def test_async_context_manager_closes_session(self, client):
+        """Test leaving the async with block closes the session."""
+        session = fake_session()
+        client._session = session
+        
+        async def run():
+            async with client as entered:
+                assert entered is client
+        
+        asyncio.run(run())
+        session.close.assert_awaited_once()
+    
+    def test_identical_requests_share_one_call(self, client):
+        """Test concurrent identical prompts are coalesced into one request."""
+        client.current_model = "llama2"
+        calls = []
+        
+        async def fake_request(method, url, json=None):
+            calls.append(json["prompt"])
+            await asyncio.sleep(0.01)
+            return {"response": json["prompt"] + "!"}
+        
+        client._request_json = fake_request
+        
+        async def run():
+            return await asyncio.gather(
+                *(client.generate_response("same") for _ in range(4)),
+                client.generate_response("other")
+            )
+        
+        assert asyncio.run(run()) == ["same!"] * 4 + ["other!"]
+        assert sorted(calls) == ["other", "same"]
+        assert client._inflight == {}
+    
     def test_generate_response_no_model(self, client):
         """Test response generation without loaded model."""
         with pytest.raises(ValueError, match="No model loaded"):
@@ -204,29 +396,32 @@ class TestOllamaClient:
     def test_get_model_config(self, client):
         """Test getting model configuration."""
         config = client.get_model_config()
-        assert isinstance(config, dict)
+        assert isinstance(config, Mapping)
         
         # Modify original config
         client.model_config["temperature"] = 0.5
         
-        # Returned config should be a copy
+        # Returned config is a read-only view that tracks changes
         new_config = client.get_model_config()
-        new_config["temperature"] = 0.8
+        assert new_config["temperature"] == 0.5
+        with pytest.raises(TypeError):
+            new_config["temperature"] = 0.8
         
         assert client.model_config["temperature"] == 0.5
     
-    @patch('requests.request')
-    def test_pull_model(self, mock_request, client):
+    def test_pull_model(self, client):
         """Test pulling a model."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_request.return_value = mock_response
+        client._session = fake_session(FakeResponse({"status": "success"}))
         
         result = asyncio.run(client.pull_model("llama2"))
         assert result is True
+        
+        # The payload is sent as a pre-encoded JSON body
+        kwargs = client._session.request.call_args.kwargs
+        assert json.loads(kwargs["data"]) == {"name": "llama2", "stream": False}
+        assert kwargs["headers"]["Content-Type"] == "application/json"
     
-    @patch('requests.request')
-    def test_delete_model(self, mock_request, client):
+    def test_delete_model(self, client):
         """Test deleting a model."""
         # Add model to available models
         from src.core.ollama_client import ModelInfo
@@ -238,9 +433,8 @@ class TestOllamaClient:
         )
         client.current_model = "test_model"
         
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_request.return_value = mock_response
+        # The server answers a delete with an empty body
+        client._session = fake_session(FakeResponse())
         
         result = asyncio.run(client.delete_model("test_model"))
         
@@ -248,39 +442,40 @@ class TestOllamaClient:
         assert "test_model" not in client.available_models
         assert client.current_model is None
     
-    @patch('requests.request')
-    def test_get_server_info(self, mock_request, client):
+    def test_get_server_info(self, client):
         """Test getting server information."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"version": "0.1.0"}
-        mock_request.return_value = mock_response
+        client._session = fake_session(FakeResponse({"version": "0.1.0"}))
         
-        info = client.get_server_info()
+        info = asyncio.run(client.get_server_info())
         assert info == {"version": "0.1.0"}
+        
+        # Repeat calls are served from the cache
+        assert asyncio.run(client.get_server_info()) == {"version": "0.1.0"}
+        assert client._session.request.call_count == 1
     
-    @patch('requests.request')
-    def test_retry_mechanism(self, mock_request, client):
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_retry_mechanism(self, mock_sleep, client):
         """Test retry mechanism on failures."""
         # First two calls fail, third succeeds
-        mock_request.side_effect = [
+        client._session = fake_session(
             Exception("Connection failed"),
             Exception("Connection failed"),
-            Mock(status_code=200, json=lambda: {"models": []})
-        ]
+            FakeResponse({"models": []})
+        )
         
         result = asyncio.run(client.list_models())
         assert result == []
-        assert mock_request.call_count == 3
+        assert client._session.request.call_count == 3
     
-    @patch('requests.request')
-    def test_circuit_breaker_integration(self, mock_request, client):
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_circuit_breaker_integration(self, mock_sleep, client):
         """Test circuit breaker integration."""
         # Configure circuit breaker with low threshold
         client.circuit_breaker = CircuitBreaker(failure_threshold=2)
         
         # Cause failures to open circuit
-        mock_request.side_effect = Exception("Connection failed")
+        client._session = fake_session()
+        client._session.request.side_effect = Exception("Connection failed")
         
         # First two attempts should fail and open circuit
         with pytest.raises(Exception):
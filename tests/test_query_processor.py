@@ -0,0 +1,221 @@
+"""
+Unit tests for natural language query processing.
+"""
+
+import pytest
+import asyncio
+import re
+import pandas as pd
+from unittest.mock import Mock, AsyncMock
+
+from src.core.query_processor import QueryProcessor
+
+
+class TestQueryProcessor:
+    """Test query processing functionality."""
+    
+    @pytest.fixture
+    def processor(self):
+        """Create test query processor with a mocked Ollama client."""
+        client = Mock(spec=['generate_response'])
+        client.generate_response = AsyncMock(return_value="{}")
+        return QueryProcessor(client)
+    
+    @pytest.fixture
+    def sample_data(self):
+        """Create sample test data."""
+        return pd.DataFrame({
+            'date': pd.date_range('2023-01-01', periods=4),
+            'sales': [10, 12, 15, 11],
+            'region': ['north', 'south', 'north', 'south']
+        })
+    
+    @pytest.mark.parametrize("query", [
+        "show the trend of sales over time",
+        "forecast next month and predict future growth",
+        "compare revenue vs cost between regions",
+        "group customers into 4 clusters by similar behaviour",
+        "find seasonal patterns and outliers in the time series",
+        "average and median of sales, plus the correlation with price",
+        "nothing to see here"
+    ])
+    def test_single_pass_scores_match_per_intent_scan(self, processor, query):
+        """Test the combined regex scores like scanning each intent separately."""
+        expected = {}
+        for intent_type, patterns in processor.query_patterns.items():
+            alternation = '|'.join(sorted((p.pattern for p in patterns), key=len, reverse=True))
+            score = len(re.findall(rf'\b(?:{alternation})', query, re.IGNORECASE))
+            if score:
+                expected[intent_type] = score
+        
+        intent = asyncio.run(processor._detect_intent(query, pd.DataFrame()))
+        assert intent['intent_scores'] == expected
+    
+    def test_detect_intent_primary(self, processor, sample_data):
+        """Test the highest scoring intent is chosen."""
+        intent = asyncio.run(processor._detect_intent("show sales trends over time", sample_data))
+        assert intent['primary_intent'] == 'trend_analysis'
+        
+        intent = asyncio.run(processor._detect_intent("hello there", sample_data))
+        assert intent['primary_intent'] == 'general_analysis'
+        assert intent['intent_scores'] == {}
+    
+    def test_llm_intent_cached_per_query_and_schema(self, processor, sample_data):
+        """Test repeated queries against the same schema reuse the LLM answer."""
+        processor.ollama_client.generate_response.return_value = '{"primary_intent": "forecasting"}'
+        
+        first = asyncio.run(processor._llm_intent_detection("forecast sales", sample_data))
+        second = asyncio.run(processor._llm_intent_detection("forecast sales", sample_data.copy()))
+        assert first == second == {"primary_intent": "forecasting"}
+        assert processor.ollama_client.generate_response.await_count == 1
+        
+        # A different schema asks the LLM again
+        asyncio.run(processor._llm_intent_detection("forecast sales", sample_data[['sales']]))
+        assert processor.ollama_client.generate_response.await_count == 2
+    
+    def test_process_query_runs_llm_calls_concurrently(self, processor, sample_data):
+        """Test intent and parameter LLM calls overlap in process_query."""
+        in_flight = []
+        peak = []
+        
+        async def fake_generate(prompt):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return "{}"
+        
+        processor.ollama_client.generate_response = fake_generate
+        
+        result = asyncio.run(processor.process_query("Show sales trends over time", sample_data))
+        
+        assert result['detected_intent']['primary_intent'] == 'trend_analysis'
+        assert result['detected_intent']['llm_intent'] == {}
+        assert result['analysis_specification']['method'] == 'analyze_trends'
+        assert max(peak) == 2
+    
+    def test_streamed_json_stops_at_first_object(self, sample_data):
+        """Test streamed LLM JSON is parsed as soon as the object completes."""
+        chunks = ['Sure: {"primary_intent": "fore', 'casting", "note": "a } b"}', ' trailing', ' text']
+        consumed = []
+        closed = []
+        
+        async def fake_stream(prompt):
+            try:
+                for chunk in chunks:
+                    consumed.append(chunk)
+                    yield chunk
+            finally:
+                closed.append(True)
+        
+        client = Mock(spec=['generate_response', 'generate_streaming_response'])
+        client.generate_streaming_response = fake_stream
+        processor = QueryProcessor(client, stream_json=True)
+        
+        intent = asyncio.run(processor._llm_intent_detection("forecast sales", sample_data))
+        assert intent == {"primary_intent": "forecasting", "note": "a } b"}
+        assert consumed == chunks[:2]
+        assert closed == [True]
+    
+    def test_json_uses_generate_response_by_default(self, sample_data):
+        """Test JSON prompts go through generate_response unless streaming is enabled."""
+        client = Mock(spec=['generate_response', 'generate_streaming_response'])
+        client.generate_response = AsyncMock(return_value='{"primary_intent": "forecasting"}')
+        processor = QueryProcessor(client)
+        
+        intent = asyncio.run(processor._llm_intent_detection("forecast sales", sample_data))
+        assert intent == {"primary_intent": "forecasting"}
+        client.generate_response.assert_awaited_once()
+        client.generate_streaming_response.assert_not_called()
+    
+    def test_schema_summary_truncates_wide_frames(self, processor):
+        """Test prompts describe wide frames with a bounded column list."""
+        data = pd.DataFrame({f'c{i}': [i] for i in range(50)})
+        
+        summary = processor._schema_summary(data)
+        assert summary['shape'] == (1, 50)
+        assert summary['columns'] == [f'c{i}' for i in range(30)]
+        assert summary['numeric_cols'] == [f'c{i}' for i in range(10)]
+        assert summary['truncated'] is True
+        assert processor._schema_summary(data[['c0']])['truncated'] is False
+    
+    def test_process_query_skips_llm_for_clear_queries(self, processor, sample_data):
+        """Test confident rule matches with all required parameters skip the LLM."""
+        result = asyncio.run(processor.process_query("forecast next month", sample_data))
+        
+        llm_intent = result['detected_intent']['llm_intent']
+        assert llm_intent['primary_intent'] == 'forecasting'
+        assert llm_intent['source'] == 'rules'
+        # Only the explanation prompt reaches the LLM
+        assert processor.ollama_client.generate_response.await_count == 1
+        
+        # Tied intents still ask the LLM
+        asyncio.run(processor.process_query("predict future", sample_data))
+        assert processor.ollama_client.generate_response.await_count == 4
+    
+    def test_extract_rule_parameters_keywords(self, processor, sample_data):
+        """Test keyword-driven parameters, including inflected keywords."""
+        params = processor._extract_numeric_parameters("forecasting 12 periods", frozenset({'forecasting', '12', 'periods'}))
+        assert params == {'periods': 12}
+        
+        params = processor._extract_rule_parameters(
+            "is sales increasing", sample_data, {'primary_intent': 'trend_analysis'}
+        )
+        assert params['trend_direction'] == 'increasing'
+        
+        params = processor._extract_rule_parameters(
+            "compare between north and south", sample_data, {'primary_intent': 'comparison'}
+        )
+        assert params['compare_values'] == ['north', 'south']
+        assert params['group_by'] == 'region'
+    
+    def test_process_queries_bounded_and_ordered(self, processor, sample_data):
+        """Test batch processing keeps query order and caps concurrent queries."""
+        in_flight = []
+        peak = []
+        
+        async def fake_generate(prompt):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return "{}"
+        
+        processor.ollama_client.generate_response = fake_generate
+        queries = [f"show sales trends over time {i}" for i in range(6)]
+        
+        results = asyncio.run(processor.process_queries(queries, sample_data, max_concurrency=2))
+        
+        assert [r['original_query'] for r in results] == queries
+        # Two queries at a time, each with its intent and parameter calls overlapping
+        assert max(peak) == 4
+    
+    def test_process_queries_processes_duplicates_once(self, processor, sample_data):
+        """Test repeated queries in a batch share one processing run."""
+        queries = ["average sales", "median sales", "average sales"]
+        
+        results = asyncio.run(processor.process_queries(queries, sample_data))
+        
+        assert [r['original_query'] for r in results] == queries
+        assert results[0] == results[2] and results[0] is not results[2]
+        # Intent, parameters and explanation prompts for each distinct query
+        assert processor.ollama_client.generate_response.await_count == 6
+    
+    def test_extract_column_references(self, processor):
+        """Test exact and partial column references, including nested names."""
+        data = pd.DataFrame(columns=['Sales', 'sales_total', 'unit_price', 'Region'])
+        
+        columns = processor._extract_column_references("plot sales_total by region", data)
+        assert columns == ['Sales', 'sales_total', 'Region']
+        
+        columns = processor._extract_column_references("what is the price", data)
+        assert columns == ['unit_price']
+    
+    def test_extract_time_parameters(self, processor, sample_data):
+        """Test time column and frequency extraction."""
+        params = processor._extract_time_parameters("weekly sales", sample_data)
+        assert params == {'time_column': 'date', 'frequency': 'weekly'}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])